@@ -16,14 +16,37 @@ Key Capabilities:
 import os
 import ast
 import json
+import mmap
 import sqlite3
 from pathlib import Path
 from typing import Dict, List, Set, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import subprocess
 
-@dataclass
+try:
+    import numpy as np
+except ImportError:
+    # numpy is optional - technical debt thresholding falls back to plain comparisons
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional - list columns are serialized with the stdlib json module
+    orjson = None
+
+# Python sources above this size are parsed straight from a memory map
+MMAP_PARSE_THRESHOLD = 256 * 1024
+
+def _to_json(value) -> str:
+    """Serialize a list column for SQLite, using orjson's native encoder when available"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+@dataclass(slots=True)
 class CodeFile:
     """Represents a code file in the codebase"""
     path: str
@@ -36,7 +59,7 @@ class CodeFile:
     last_modified: str
     authors: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class CodePattern:
     """A detected coding pattern"""
     pattern_type: str
@@ -45,7 +68,7 @@ class CodePattern:
     frequency: int
     confidence: float
 
-@dataclass
+@dataclass(slots=True)
 class TechnicalDebt:
     """Technical debt item"""
     file: str
@@ -55,7 +78,7 @@ class TechnicalDebt:
     description: str
     suggestion: str
 
-@dataclass
+@dataclass(slots=True)
 class Architecture:
     """Overall architecture understanding"""
     framework: str
@@ -143,14 +166,31 @@ class CodeArchaeologist:
         
         print(f"Excavating codebase at {self.codebase_path}...")
         
-        # Step 1: Scan all files
-        files = self._scan_files()
-        print(f"Found {len(files)} code files")
+        # Steps 1 & 2: Scan files and analyze them as they are discovered,
+        # so worker processes start parsing while the walk is still running
+        listings = {}
+        results = {}
+        with ProcessPoolExecutor(initializer=_init_analysis_worker,
+                                 initargs=(str(self.codebase_path),)) as pool:
+            # Bring the workers up before the walker threads start, so no
+            # fork happens while another thread may hold a lock
+            pool.submit(_worker_ready).result()
+            futures = {}
+            for directory, dir_files, subdirs in self._iter_directory_listings():
+                listings[directory] = (dir_files, subdirs)
+                for file_path in dir_files:
+                    futures[pool.submit(_analyze_file_worker, file_path)] = file_path
+            
+            files = self._order_listings(listings)
+            print(f"Found {len(files)} code files")
+            
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
         
-        # Step 2: Analyze each file
+        # Keep scan order for storage and downstream analysis
         analyzed_files = []
         for file_path in files:
-            analysis = self._analyze_file(file_path)
+            analysis = results[file_path]
             if analysis:
                 analyzed_files.append(analysis)
                 self._store_file_analysis(analysis)
@@ -181,60 +221,130 @@ class CodeArchaeologist:
             'files': analyzed_files,
             'patterns': patterns,
             'technical_debt': debt,
-            'architecture': asdict(architecture),
+            'architecture': {
+                'framework': architecture.framework,
+                'structure': architecture.structure,
+                'layers': architecture.layers,
+                'entry_points': architecture.entry_points,
+                'database': architecture.database,
+                'api_style': architecture.api_style
+            },
             'dependencies': dependencies,
             'history': history,
             'summary': self._generate_summary(analyzed_files, patterns, debt, architecture)
         }
     
-    def _scan_files(self) -> List[Path]:
-        """Scan for all code files"""
+    def _iter_directory_listings(self, max_workers: int = 8):
+        """
+        Yield (directory, code_files, subdirs) as each directory is listed
+        
+        Directories are listed in parallel (os.scandir releases the GIL), so
+        listings arrive in completion order rather than walk order.
+        """
         code_extensions = {'.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.go', '.rs', '.rb'}
         ignore_dirs = {'node_modules', '.git', '__pycache__', 'venv', 'env', 'dist', 'build'}
         
+        def visit(directory: str):
+            files, subdirs = [], []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        
+                        if is_dir:
+                            # Like os.walk, don't descend into symlinked directories
+                            if entry.name not in ignore_dirs and not entry.is_symlink():
+                                subdirs.append(entry.path)
+                        elif os.path.splitext(entry.name)[1] in code_extensions:
+                            files.append(Path(entry.path))
+            except OSError:
+                pass
+            return directory, files, subdirs
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {executor.submit(visit, str(self.codebase_path))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory, files, subdirs = future.result()
+                    for subdir in subdirs:
+                        pending.add(executor.submit(visit, subdir))
+                    yield directory, files, subdirs
+    
+    def _order_listings(self, listings: Dict) -> List[Path]:
+        """Flatten directory listings into the same top-down order os.walk produces"""
         files = []
-        for root, dirs, filenames in os.walk(self.codebase_path):
-            # Remove ignored directories
-            dirs[:] = [d for d in dirs if d not in ignore_dirs]
-            
-            for filename in filenames:
-                if Path(filename).suffix in code_extensions:
-                    files.append(Path(root) / filename)
-        
+        stack = [str(self.codebase_path)]
+        while stack:
+            dir_files, subdirs = listings[stack.pop()]
+            files.extend(dir_files)
+            stack.extend(reversed(subdirs))
         return files
     
     def _analyze_file(self, file_path: Path) -> Optional[CodeFile]:
         """Analyze a single code file"""
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
             # Determine language
             language = self._detect_language(file_path)
             
-            # Count lines
-            lines = len(content.splitlines())
+            # Every path counts lines the same way (newline bytes), so a file's
+            # count doesn't depend on its size or language
+            lines = self._count_lines(file_path)
+            
+            # Generic files only need the line count, so they are never
+            # decoded - files that aren't valid UTF-8 are still recorded
+            if language not in ['python', 'javascript', 'typescript']:
+                return self._analyze_generic_file(file_path, lines, language)
+            
+            # Large Python sources: let the parser read page-cache-backed bytes
+            if language == 'python' and file_path.stat().st_size > MMAP_PARSE_THRESHOLD:
+                with open(file_path, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._analyze_python_file(file_path, mm, lines)
+            
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
             
             # Language-specific analysis
             if language == 'python':
                 return self._analyze_python_file(file_path, content, lines)
-            elif language in ['javascript', 'typescript']:
-                return self._analyze_js_file(file_path, content, lines)
             else:
-                return self._analyze_generic_file(file_path, content, lines, language)
+                return self._analyze_js_file(file_path, content, lines)
                 
         except Exception as e:
             print(f"Error analyzing {file_path}: {e}")
             return None
     
-    def _analyze_python_file(self, file_path: Path, content: str, lines: int) -> CodeFile:
-        """Analyze Python file using AST"""
+    def _count_lines(self, file_path: Path, chunk_size: int = 65536) -> int:
+        """Count lines in 64 KiB chunks without holding the whole file in memory"""
+        
+        lines = 0
+        last = b'\n'
+        with open(file_path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                lines += chunk.count(b'\n')
+                last = chunk[-1:]
+        
+        # A trailing line without a newline still counts
+        if last != b'\n':
+            lines += 1
+        
+        return lines
+    
+    def _analyze_python_file(self, file_path: Path, content, lines: int) -> CodeFile:
+        """Analyze Python file using AST (content is a str or a bytes-like buffer)"""
         
         try:
-            tree = ast.parse(content)
+            tree = ast.parse(content, filename=str(file_path))
         except:
-            return self._analyze_generic_file(file_path, content, lines, 'python')
+            return self._analyze_generic_file(file_path, lines, 'python')
         
         functions = []
         classes = []
@@ -299,7 +409,7 @@ class CodeArchaeologist:
             authors=authors
         )
     
-    def _analyze_generic_file(self, file_path: Path, content: str, lines: int, language: str) -> CodeFile:
+    def _analyze_generic_file(self, file_path: Path, lines: int, language: str) -> CodeFile:
         """Generic file analysis"""
         
         last_modified, authors = self._get_git_info(file_path)
@@ -385,22 +495,27 @@ class CodeArchaeologist:
         
         if all_imports:
             # Check for common frameworks
+            # Lowercase each import once and scan the cached copies
+            all_imports_lower = [imp.lower() for imp in all_imports]
+            
             frameworks = defaultdict(int)
-            for imp in all_imports:
-                if 'flask' in imp.lower():
+            for imp in all_imports_lower:
+                if 'flask' in imp:
                     frameworks['Flask'] += 1
-                elif 'fastapi' in imp.lower():
+                elif 'fastapi' in imp:
                     frameworks['FastAPI'] += 1
-                elif 'django' in imp.lower():
+                elif 'django' in imp:
                     frameworks['Django'] += 1
-                elif 'react' in imp.lower():
+                elif 'react' in imp:
                     frameworks['React'] += 1
             
             for framework, count in frameworks.items():
+                needle = framework.lower()
                 patterns.append(CodePattern(
                     pattern_type='framework',
                     description=f'Uses {framework}',
-                    examples=[imp for imp in all_imports if framework.lower() in imp.lower()][:3],
+                    examples=[imp for imp, imp_lower in zip(all_imports, all_imports_lower)
+                              if needle in imp_lower][:3],
                     frequency=count,
                     confidence=min(count / len(files), 1.0)
                 ))
@@ -428,9 +543,28 @@ class CodeArchaeologist:
         
         debt_items = []
         
-        for file in files:
+        # Threshold every file at once, then only visit the files that hit
+        if np is not None and files:
+            count = len(files)
+            lines = np.fromiter((f.lines for f in files), dtype=np.int64, count=count)
+            complexity = np.fromiter((f.complexity for f in files), dtype=np.int64, count=count)
+            n_imports = np.fromiter((len(f.imports) for f in files), dtype=np.int64, count=count)
+            large_mask = lines > 500
+            complex_mask = complexity > 20
+            imports_mask = n_imports > 15
+            hits = np.flatnonzero(large_mask | complex_mask | imports_mask).tolist()
+            large_mask, complex_mask, imports_mask = large_mask.tolist(), complex_mask.tolist(), imports_mask.tolist()
+        else:
+            large_mask = [f.lines > 500 for f in files]
+            complex_mask = [f.complexity > 20 for f in files]
+            imports_mask = [len(f.imports) > 15 for f in files]
+            hits = [i for i in range(len(files)) if large_mask[i] or complex_mask[i] or imports_mask[i]]
+        
+        for i in hits:
+            file = files[i]
+            
             # Large files
-            if file.lines > 500:
+            if large_mask[i]:
                 debt_items.append(TechnicalDebt(
                     file=file.path,
                     line=0,
@@ -441,7 +575,7 @@ class CodeArchaeologist:
                 ))
             
             # High complexity
-            if file.complexity > 20:
+            if complex_mask[i]:
                 debt_items.append(TechnicalDebt(
                     file=file.path,
                     line=0,
@@ -452,7 +586,7 @@ class CodeArchaeologist:
                 ))
             
             # Too many imports
-            if len(file.imports) > 15:
+            if imports_mask[i]:
                 debt_items.append(TechnicalDebt(
                     file=file.path,
                     line=0,
@@ -476,21 +610,24 @@ class CodeArchaeologist:
         for file in files:
             all_imports.extend(file.imports)
         
+        # Lowercase each import once; every detector below scans the cached copies
+        all_imports_lower = [imp.lower() for imp in all_imports]
+        
         framework = 'unknown'
-        for imp in all_imports:
-            if 'flask' in imp.lower():
+        for imp in all_imports_lower:
+            if 'flask' in imp:
                 framework = 'Flask'
                 break
-            elif 'fastapi' in imp.lower():
+            elif 'fastapi' in imp:
                 framework = 'FastAPI'
                 break
-            elif 'django' in imp.lower():
+            elif 'django' in imp:
                 framework = 'Django'
                 break
-            elif 'express' in imp.lower():
+            elif 'express' in imp:
                 framework = 'Express'
                 break
-            elif 'react' in imp.lower():
+            elif 'react' in imp:
                 framework = 'React'
                 break
         
@@ -518,17 +655,17 @@ class CodeArchaeologist:
         
         # Detect database
         database = None
-        for imp in all_imports:
-            if 'postgres' in imp.lower() or 'psycopg' in imp.lower():
+        for imp in all_imports_lower:
+            if 'postgres' in imp or 'psycopg' in imp:
                 database = 'PostgreSQL'
                 break
-            elif 'mysql' in imp.lower():
+            elif 'mysql' in imp:
                 database = 'MySQL'
                 break
-            elif 'sqlite' in imp.lower():
+            elif 'sqlite' in imp:
                 database = 'SQLite'
                 break
-            elif 'mongo' in imp.lower():
+            elif 'mongo' in imp:
                 database = 'MongoDB'
                 break
         
@@ -552,16 +689,18 @@ class CodeArchaeologist:
         dependencies = []
         
         # Create file lookup by name
-        file_lookup = {Path(f.path).stem: f for f in files}
+        file_lookup = {Path(f.path).stem: f.path for f in files}
+        lookup = file_lookup.get
         
         for file in files:
+            source = file.path
             for imp in file.imports:
-                # Check if import is internal
-                imp_name = imp.split('.')[-1]
-                if imp_name in file_lookup:
+                # Check if import is internal (rpartition avoids building a list per import)
+                target = lookup(imp.rpartition('.')[2])
+                if target is not None:
                     dependencies.append({
-                        'source': file.path,
-                        'target': file_lookup[imp_name].path,
+                        'source': source,
+                        'target': target,
                         'type': 'import'
                     })
         
@@ -658,12 +797,12 @@ Entry Points:
             file.path,
             file.language,
             file.lines,
-            json.dumps(file.functions),
-            json.dumps(file.classes),
-            json.dumps(file.imports),
+            _to_json(file.functions),
+            _to_json(file.classes),
+            _to_json(file.imports),
             file.complexity,
             file.last_modified,
-            json.dumps(file.authors)
+            _to_json(file.authors)
         ))
         
         conn.commit()
@@ -680,7 +819,7 @@ Entry Points:
         """, (
             pattern.pattern_type,
             pattern.description,
-            json.dumps(pattern.examples),
+            _to_json(pattern.examples),
             pattern.frequency,
             pattern.confidence
         ))
@@ -709,6 +848,25 @@ Entry Points:
         conn.close()
 
 
+# Per-process archaeologist used by the analysis pool in excavate()
+_worker_archaeologist: Optional[CodeArchaeologist] = None
+
+def _init_analysis_worker(codebase_path: str):
+    """Process pool initializer - the file analyzers only need the codebase
+    path, so skip __init__ and never touch the archaeology database"""
+    global _worker_archaeologist
+    _worker_archaeologist = CodeArchaeologist.__new__(CodeArchaeologist)
+    _worker_archaeologist.codebase_path = Path(codebase_path)
+
+def _worker_ready() -> bool:
+    """No-op task used to start the pool's workers"""
+    return True
+
+def _analyze_file_worker(file_path: Path) -> Optional[CodeFile]:
+    """Process pool entry point - analyze a single file"""
+    return _worker_archaeologist._analyze_file(file_path)
+
+
 # Example usage
 if __name__ == "__main__":
     import sys
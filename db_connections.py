@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Shared SQLite connection setup
+
+TECPCore and SelfEvolutionEngine each keep one long-lived writer connection
+plus a read-only connection for query paths, and close whatever is still
+open when the interpreter exits.
+"""
+
+import atexit
+import itertools
+import os
+import sqlite3
+import weakref
+from urllib.request import pathname2url
+
+# Shared by both connection kinds: temp tables in RAM, a 256 MB mmap window
+# and a 64 MB page cache
+_READ_PRAGMAS = (
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+    'PRAGMA cache_size=-65536',
+)
+
+
+def connect_writer(db_path, **kwargs):
+    """Open a connection tuned for frequent small writes"""
+    conn = sqlite3.connect(db_path, cached_statements=256, **kwargs)
+    # WAL drops the per-commit rollback-journal fsync
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    for pragma in _READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def connect_reader(db_path, **kwargs):
+    """Open a read-only shared-cache connection for query-only paths"""
+    uri = f"file:{pathname2url(os.path.abspath(db_path))}?mode=ro&cache=shared"
+    conn = sqlite3.connect(uri, uri=True, cached_statements=256, **kwargs)
+    for pragma in _READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+# Objects whose close() still has to run at exit -> registration order
+_open_at_exit = weakref.WeakKeyDictionary()
+_registration_order = itertools.count()
+
+
+def close_at_exit(obj):
+    """Have obj.close() called at interpreter exit unless it is closed first"""
+    _open_at_exit[obj] = next(_registration_order)
+
+
+def forget_at_exit(obj):
+    """Drop obj from the exit hook; call this from obj.close()"""
+    _open_at_exit.pop(obj, None)
+
+
+@atexit.register
+def _close_all_at_exit():
+    """atexit hook: close still-open objects, newest first, as atexit itself does"""
+    for obj, _ in sorted(_open_at_exit.items(), key=lambda item: item[1], reverse=True):
+        obj.close()
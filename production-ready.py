@@ -18,89 +18,17 @@ Includes:
 - Documentation
 """
 
-from typing import Dict, List
-from dataclasses import dataclass
+import functools
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Tuple
 from pathlib import Path
 
-@dataclass
-class ProductionCode:
-    """Complete production-ready code package"""
-    application_code: str
-    tests: Dict[str, str]  # test_name -> test_code
-    monitoring: Dict[str, str]  # monitoring configs
-    deployment: Dict[str, str]  # deployment configs
-    ci_cd: Dict[str, str]  # CI/CD configs
-    documentation: str
-    health_checks: str
-    logging_config: str
-
-class ProductionReadyGenerator:
-    """
-    Generates production-ready code, not just prototypes
-    
-    This is what separates AI-LA from toys - it generates code
-    that you can actually deploy and maintain in production.
-    """
-    
-    def __init__(self):
-        pass
-    
-    def generate_production_code(self, description: str, framework: str = "fastapi") -> ProductionCode:
-        """
-        Generate complete production-ready application
-        
-        Takes a description and returns everything needed for production:
-        - Application code
-        - Comprehensive tests
-        - Monitoring setup
-        - Deployment configs
-        - CI/CD pipeline
-        - Documentation
-        """
-        
-        print(f"Generating production-ready {framework} application...")
-        
-        # Generate application code
-        app_code = self._generate_app_code(description, framework)
-        
-        # Generate comprehensive tests
-        tests = self._generate_tests(description, framework)
-        
-        # Generate monitoring
-        monitoring = self._generate_monitoring(framework)
-        
-        # Generate deployment configs
-        deployment = self._generate_deployment(framework)
-        
-        # Generate CI/CD
-        ci_cd = self._generate_ci_cd(framework)
-        
-        # Generate documentation
-        docs = self._generate_documentation(description, framework)
-        
-        # Generate health checks
-        health = self._generate_health_checks(framework)
-        
-        # Generate logging
-        logging_config = self._generate_logging(framework)
-        
-        return ProductionCode(
-            application_code=app_code,
-            tests=tests,
-            monitoring=monitoring,
-            deployment=deployment,
-            ci_cd=ci_cd,
-            documentation=docs,
-            health_checks=health,
-            logging_config=logging_config
-        )
-    
-    def _generate_app_code(self, description: str, framework: str) -> str:
-        """Generate production-grade application code"""
-        
-        if framework == "fastapi":
-            return f'''"""
-{description}
+# FastAPI application sections, joined in order by _generate_app_code. Only
+# the header depends on the description - it marks each slot with a
+# <<DESCRIPTION>> sentinel; the rest are literal source
+_FASTAPI_HEADER_SRC = '''"""
+<<DESCRIPTION>>
 
 Production-ready FastAPI application with:
 - Proper error handling
@@ -130,14 +58,19 @@ logger = logging.getLogger(__name__)
 
 # Initialize FastAPI with metadata
 app = FastAPI(
-    title="{description}",
+    title="<<DESCRIPTION>>",
     description="Production-ready API",
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc"
 )
 
-# Security middleware
+'''
+
+# Literal fragments around each description slot, split once at import
+_FASTAPI_HEADER_FRAGMENTS = tuple(_FASTAPI_HEADER_SRC.split('<<DESCRIPTION>>'))
+
+_FASTAPI_MIDDLEWARE = '''# Security middleware
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Configure for production
@@ -158,75 +91,81 @@ async def add_process_time_header(request: Request, call_next):
     response = await call_next(request)
     process_time = time.time() - start_time
     response.headers["X-Process-Time"] = str(process_time)
-    logger.info(f"{{request.method}} {{request.url.path}} - {{process_time:.3f}}s")
+    logger.info(f"{request.method} {request.url.path} - {process_time:.3f}s")
     return response
 
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Unhandled exception: {{exc}}", exc_info=True)
+    logger.error(f"Unhandled exception: {exc}", exc_info=True)
     return JSONResponse(
         status_code=500,
-        content={{"detail": "Internal server error", "timestamp": datetime.utcnow().isoformat()}}
+        content={"detail": "Internal server error", "timestamp": datetime.utcnow().isoformat()}
     )
 
-# Health check endpoint
+'''
+
+_FASTAPI_PROBES = '''# Health check endpoint
 @app.get("/health")
 async def health_check():
     """Health check endpoint for load balancers"""
-    return {{
+    return {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "version": "1.0.0"
-    }}
+    }
 
 # Readiness check endpoint
 @app.get("/ready")
 async def readiness_check():
     """Readiness check for Kubernetes"""
     # Add checks for database, cache, etc.
-    return {{
+    return {
         "status": "ready",
         "timestamp": datetime.utcnow().isoformat()
-    }}
+    }
 
 # Metrics endpoint for Prometheus
 @app.get("/metrics")
 async def metrics():
     """Prometheus metrics endpoint"""
     # Implement Prometheus metrics
-    return {{
+    return {
         "requests_total": 0,
         "requests_duration_seconds": 0.0
-    }}
+    }
 
-# Main API endpoints
+'''
+
+_FASTAPI_ITEM_MODEL = '''# Main API endpoints
 class Item(BaseModel):
     name: str = Field(..., min_length=1, max_length=100)
     description: Optional[str] = Field(None, max_length=500)
     
     class Config:
-        schema_extra = {{
-            "example": {{
+        schema_extra = {
+            "example": {
                 "name": "Example Item",
                 "description": "This is an example"
-            }}
-        }}
+            }
+        }
+
+'''
 
-@app.post("/api/items", status_code=201)
+_FASTAPI_ENDPOINTS = '''@app.post("/api/items", status_code=201)
 async def create_item(item: Item):
     """Create a new item"""
     try:
-        logger.info(f"Creating item: {{item.name}}")
+        logger.info(f"Creating item: {item.name}")
         # Implement business logic here
-        return {{
+        return {
             "id": 1,
             "name": item.name,
             "description": item.description,
             "created_at": datetime.utcnow().isoformat()
-        }}
+        }
     except Exception as e:
-        logger.error(f"Error creating item: {{e}}")
+        logger.error(f"Error creating item: {e}")
         raise HTTPException(status_code=500, detail="Failed to create item")
 
 @app.get("/api/items")
@@ -235,176 +174,193 @@ async def list_items():
     try:
         logger.info("Listing items")
         # Implement business logic here
-        return {{
+        return {
             "items": [],
             "total": 0
-        }}
+        }
     except Exception as e:
-        logger.error(f"Error listing items: {{e}}")
+        logger.error(f"Error listing items: {e}")
         raise HTTPException(status_code=500, detail="Failed to list items")
 
-@app.get("/api/items/{{item_id}}")
+@app.get("/api/items/{item_id}")
 async def get_item(item_id: int):
     """Get a specific item"""
     try:
-        logger.info(f"Getting item: {{item_id}}")
+        logger.info(f"Getting item: {item_id}")
         # Implement business logic here
-        return {{
+        return {
             "id": item_id,
             "name": "Example",
             "description": "Example item"
-        }}
+        }
     except Exception as e:
-        logger.error(f"Error getting item: {{e}}")
+        logger.error(f"Error getting item: {e}")
         raise HTTPException(status_code=404, detail="Item not found")
 
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
 '''
-        
-        return "# Application code for " + framework
-    
-    def _generate_tests(self, description: str, framework: str) -> Dict[str, str]:
-        """Generate comprehensive test suite"""
-        
-        tests = {}
-        
-        # Unit tests
-        tests['test_unit.py'] = '''"""
-Unit tests for application logic
-"""
 
-import pytest
-from app import app, Item
-from fastapi.testclient import TestClient
+# README sections, joined in order by _generate_documentation. Only the header
+# depends on the description and framework
+_DOCS_HEADER_TMPL = '''# {description}
 
-client = TestClient(app)
+## Overview
 
-def test_health_check():
-    """Test health check endpoint"""
-    response = client.get("/health")
-    assert response.status_code == 200
-    assert response.json()["status"] == "healthy"
+Production-ready API built with {framework}.
 
-def test_readiness_check():
-    """Test readiness check endpoint"""
-    response = client.get("/ready")
-    assert response.status_code == 200
-    assert response.json()["status"] == "ready"
+'''
 
-def test_create_item_success():
-    """Test successful item creation"""
-    response = client.post(
-        "/api/items",
-        json={"name": "Test Item", "description": "Test description"}
-    )
-    assert response.status_code == 201
-    data = response.json()
-    assert data["name"] == "Test Item"
-    assert "id" in data
+_DOCS_FEATURES = '''## Features
 
-def test_create_item_validation():
-    """Test item creation validation"""
-    response = client.post(
-        "/api/items",
-        json={"name": ""}  # Invalid: empty name
-    )
-    assert response.status_code == 422
+- RESTful API endpoints
+- Comprehensive error handling
+- Request validation
+- Rate limiting
+- CORS support
+- Health checks
+- Prometheus metrics
+- Structured logging
+- Docker support
+- Kubernetes ready
 
-def test_list_items():
-    """Test listing items"""
-    response = client.get("/api/items")
-    assert response.status_code == 200
-    data = response.json()
-    assert "items" in data
-    assert "total" in data
+## Quick Start
+
+### Local Development
+
+```bash
+# Install dependencies
+pip install -r requirements.txt
+
+# Run application
+python app.py
+```
+
+### Docker
+
+```bash
+# Build image
+docker build -t api .
+
+# Run container
+docker run -p 8000:8000 api
+```
+
+### Kubernetes
+
+```bash
+# Deploy
+kubectl apply -f k8s-deployment.yaml
+
+# Check status
+kubectl get pods
+```
 
-def test_get_item():
-    """Test getting specific item"""
-    response = client.get("/api/items/1")
-    assert response.status_code in [200, 404]
 '''
-        
-        # Integration tests
-        tests['test_integration.py'] = '''"""
-Integration tests for API endpoints
-"""
 
-import pytest
-from fastapi.testclient import TestClient
-from app import app
+_DOCS_API_ENDPOINTS = '''## API Endpoints
 
-client = TestClient(app)
+### Health Check
+```
+GET /health
+```
 
-def test_create_and_retrieve_item():
-    """Test creating and retrieving an item"""
-    # Create item
-    create_response = client.post(
-        "/api/items",
-        json={"name": "Integration Test", "description": "Test"}
-    )
-    assert create_response.status_code == 201
-    item_id = create_response.json()["id"]
-    
-    # Retrieve item
-    get_response = client.get(f"/api/items/{item_id}")
-    assert get_response.status_code == 200
+### Create Item
+```
+POST /api/items
+Content-Type: application/json
+
+{
+  "name": "Item name",
+  "description": "Item description"
+}
+```
+
+### List Items
+```
+GET /api/items
+```
+
+### Get Item
+```
+GET /api/items/{id}
+```
 
-def test_api_error_handling():
-    """Test API error handling"""
-    response = client.get("/api/items/99999")
-    assert response.status_code == 404
 '''
-        
-        # Load tests
-        tests['test_load.py'] = '''"""
-Load tests using locust
-"""
 
-from locust import HttpUser, task, between
+_DOCS_OPERATIONS = '''## Monitoring
+
+- Prometheus metrics: http://localhost:8000/metrics
+- Grafana dashboard: http://localhost:3000
+
+## Testing
+
+```bash
+# Run unit tests
+pytest tests/test_unit.py
+
+# Run integration tests
+pytest tests/test_integration.py
+
+# Run load tests
+locust -f tests/test_load.py
+```
 
-class APIUser(HttpUser):
-    wait_time = between(1, 3)
-    
-    @task
-    def health_check(self):
-        self.client.get("/health")
-    
-    @task(3)
-    def list_items(self):
-        self.client.get("/api/items")
-    
-    @task(2)
-    def create_item(self):
-        self.client.post(
-            "/api/items",
-            json={"name": "Load Test", "description": "Test"}
-        )
 '''
-        
-        return tests
-    
-    def _generate_monitoring(self, framework: str) -> Dict[str, str]:
-        """Generate monitoring configuration"""
-        
-        monitoring = {}
-        
-        # Prometheus configuration
-        monitoring['prometheus.yml'] = '''
-global:
-  scrape_interval: 15s
-  evaluation_interval: 15s
 
-scrape_configs:
-  - job_name: 'api'
-    static_configs:
+_DOCS_DEPLOYMENT = '''## Deployment
+
+### Production Checklist
+
+- [ ] Configure environment variables
+- [ ] Set up database
+- [ ] Configure CORS origins
+- [ ] Set up monitoring
+- [ ] Configure logging
+- [ ] Set up backups
+- [ ] Configure auto-scaling
+- [ ] Set up alerts
+
+## Security
+
+- HTTPS only in production
+- Rate limiting enabled
+- Input validation
+- SQL injection protection
+- XSS protection
+- CSRF protection
+
+## Performance
+
+- Response time < 100ms (p95)
+- Throughput > 1000 req/s
+- Auto-scaling enabled
+- Caching configured
+
+## Support
+
+For issues and questions, please open a GitHub issue.
+'''
+
+# Static configuration bodies - they don't depend on the description or
+# framework, so they are built once at import and shared read-only
+
+# Prometheus configuration
+_PROMETHEUS_YML = '''
+global:
+  scrape_interval: 15s
+  evaluation_interval: 15s
+
+scrape_configs:
+  - job_name: 'api'
+    static_configs:
       - targets: ['localhost:8000']
     metrics_path: '/metrics'
 '''
-        
-        # Grafana dashboard
-        monitoring['grafana-dashboard.json'] = '''
+
+# Grafana dashboard
+_GRAFANA_DASHBOARD_JSON = '''
 {
   "dashboard": {
     "title": "API Monitoring",
@@ -440,16 +396,9 @@ scrape_configs:
   }
 }
 '''
-        
-        return monitoring
-    
-    def _generate_deployment(self, framework: str) -> Dict[str, str]:
-        """Generate deployment configurations"""
-        
-        deployment = {}
-        
-        # Dockerfile
-        deployment['Dockerfile'] = '''
+
+# Dockerfile
+_DOCKERFILE = '''
 FROM python:3.11-slim
 
 WORKDIR /app
@@ -475,9 +424,9 @@ EXPOSE 8000
 # Run application
 CMD ["uvicorn", "app:app", "--host", "0.0.0.0", "--port", "8000"]
 '''
-        
-        # Docker Compose
-        deployment['docker-compose.yml'] = '''
+
+# Docker Compose
+_DOCKER_COMPOSE = '''
 version: '3.8'
 
 services:
@@ -508,9 +457,9 @@ services:
       - "3000:3000"
     restart: unless-stopped
 '''
-        
-        # Kubernetes deployment
-        deployment['k8s-deployment.yaml'] = '''
+
+# Kubernetes deployment
+_K8S_DEPLOYMENT = '''
 apiVersion: apps/v1
 kind: Deployment
 metadata:
@@ -566,16 +515,9 @@ spec:
     targetPort: 8000
   type: LoadBalancer
 '''
-        
-        return deployment
-    
-    def _generate_ci_cd(self, framework: str) -> Dict[str, str]:
-        """Generate CI/CD pipeline configurations"""
-        
-        ci_cd = {}
-        
-        # GitHub Actions
-        ci_cd['.github/workflows/ci.yml'] = '''
+
+# GitHub Actions
+_GITHUB_CI = '''
 name: CI/CD Pipeline
 
 on:
@@ -630,147 +572,9 @@ jobs:
       run: |
         echo "Deploy to Kubernetes"
 '''
-        
-        return ci_cd
-    
-    def _generate_documentation(self, description: str, framework: str) -> str:
-        """Generate comprehensive documentation"""
-        
-        return f'''# {description}
-
-## Overview
-
-Production-ready API built with {framework}.
-
-## Features
-
-- RESTful API endpoints
-- Comprehensive error handling
-- Request validation
-- Rate limiting
-- CORS support
-- Health checks
-- Prometheus metrics
-- Structured logging
-- Docker support
-- Kubernetes ready
-
-## Quick Start
-
-### Local Development
-
-```bash
-# Install dependencies
-pip install -r requirements.txt
-
-# Run application
-python app.py
-```
-
-### Docker
-
-```bash
-# Build image
-docker build -t api .
-
-# Run container
-docker run -p 8000:8000 api
-```
-
-### Kubernetes
-
-```bash
-# Deploy
-kubectl apply -f k8s-deployment.yaml
-
-# Check status
-kubectl get pods
-```
-
-## API Endpoints
-
-### Health Check
-```
-GET /health
-```
-
-### Create Item
-```
-POST /api/items
-Content-Type: application/json
-
-{{
-  "name": "Item name",
-  "description": "Item description"
-}}
-```
-
-### List Items
-```
-GET /api/items
-```
-
-### Get Item
-```
-GET /api/items/{{id}}
-```
-
-## Monitoring
-
-- Prometheus metrics: http://localhost:8000/metrics
-- Grafana dashboard: http://localhost:3000
-
-## Testing
-
-```bash
-# Run unit tests
-pytest tests/test_unit.py
-
-# Run integration tests
-pytest tests/test_integration.py
-
-# Run load tests
-locust -f tests/test_load.py
-```
-
-## Deployment
-
-### Production Checklist
-
-- [ ] Configure environment variables
-- [ ] Set up database
-- [ ] Configure CORS origins
-- [ ] Set up monitoring
-- [ ] Configure logging
-- [ ] Set up backups
-- [ ] Configure auto-scaling
-- [ ] Set up alerts
-
-## Security
-
-- HTTPS only in production
-- Rate limiting enabled
-- Input validation
-- SQL injection protection
-- XSS protection
-- CSRF protection
-
-## Performance
 
-- Response time < 100ms (p95)
-- Throughput > 1000 req/s
-- Auto-scaling enabled
-- Caching configured
-
-## Support
-
-For issues and questions, please open a GitHub issue.
-'''
-    
-    def _generate_health_checks(self, framework: str) -> str:
-        """Generate health check implementation"""
-        
-        return '''"""
+# Health check implementation
+_HEALTH_CHECKS_PY = '''"""
 Health check implementations
 """
 
@@ -817,11 +621,9 @@ async def comprehensive_health_check() -> Dict:
         "overall": all(results)
     }
 '''
-    
-    def _generate_logging(self, framework: str) -> str:
-        """Generate logging configuration"""
-        
-        return '''"""
+
+# Structured logging configuration
+_LOGGING_PY = '''"""
 Structured logging configuration
 """
 
@@ -858,6 +660,347 @@ def configure_logging(level=logging.INFO):
     root_logger.addHandler(handler)
 '''
 
+_MONITORING_CONFIGS: Mapping[str, str] = MappingProxyType({
+    'prometheus.yml': _PROMETHEUS_YML,
+    'grafana-dashboard.json': _GRAFANA_DASHBOARD_JSON,
+})
+
+_DEPLOYMENT_CONFIGS: Mapping[str, str] = MappingProxyType({
+    'Dockerfile': _DOCKERFILE,
+    'docker-compose.yml': _DOCKER_COMPOSE,
+    'k8s-deployment.yaml': _K8S_DEPLOYMENT,
+})
+
+_CI_CD_CONFIGS: Mapping[str, str] = MappingProxyType({
+    '.github/workflows/ci.yml': _GITHUB_CI,
+})
+
+
+# Most (description, framework) packages a generator keeps memoized
+PACKAGE_CACHE_SIZE = 128
+
+
+class ProductionCode:
+    """
+    Complete production-ready code package
+    
+    Each bundle is generated on first access, so callers that only read one
+    or two bundles don't pay for the rest. The description-dependent text
+    (application code and documentation) is kept UTF-8 encoded in a single
+    per-package buffer; use text_length() to size it without decoding.
+    
+    Packages are memoized and shared between callers, so description and
+    framework are read-only and pool updates are serialized by a lock.
+    """
+    
+    def __init__(self, description: str, framework: str, generator: 'ProductionReadyGenerator'):
+        self._description = description
+        self._framework = framework
+        self._generator = generator
+        self._lock = threading.Lock()
+        self._pool = bytearray()
+        self._slices: Dict[str, Tuple[int, int, int]] = {}  # name -> (offset, bytes, chars)
+    
+    @property
+    def description(self) -> str:
+        return self._description
+    
+    @property
+    def framework(self) -> str:
+        return self._framework
+    
+    def __repr__(self) -> str:
+        return f"ProductionCode(description={self.description!r}, framework={self.framework!r})"
+    
+    def _pooled(self, name: str, build: Callable[[], str]) -> str:
+        """Generate a text bundle into the pool once, then serve it from there"""
+        if name not in self._slices:
+            self._store(name, build())
+        with self._lock:
+            offset, size, _ = self._slices[name]
+            # Decode straight from the pool; the view is released before the
+            # lock is, so later appends can still resize the buffer
+            with memoryview(self._pool) as view:
+                return str(view[offset:offset + size], 'utf-8')
+    
+    def _store(self, name: str, text: str):
+        data = text.encode('utf-8')
+        with self._lock:
+            # Another thread may have built the same bundle meanwhile
+            if name not in self._slices:
+                self._slices[name] = (len(self._pool), len(data), len(text))
+                self._pool += data
+    
+    def text_length(self, name: str) -> int:
+        """Character count of a pooled text bundle, without decoding it"""
+        if name not in self._slices:
+            self._store(name, self._pooled_builders[name](self))
+        return self._slices[name][2]
+    
+    def _build_application_code(self) -> str:
+        return self._generator._generate_app_code(self.description, self.framework)
+    
+    def _build_documentation(self) -> str:
+        return self._generator._generate_documentation(self.description, self.framework)
+    
+    # Pooled bundle name -> builder, shared by the properties and text_length()
+    _pooled_builders: Mapping[str, Callable[['ProductionCode'], str]] = MappingProxyType({
+        'application_code': _build_application_code,
+        'documentation': _build_documentation,
+    })
+    
+    @property
+    def application_code(self) -> str:
+        return self._pooled('application_code', self._build_application_code)
+    
+    @functools.cached_property
+    def tests(self) -> Mapping[str, str]:
+        """test_name -> test_code (read-only)"""
+        return self._generator._generate_tests(self.description, self.framework)
+    
+    @functools.cached_property
+    def monitoring(self) -> Mapping[str, str]:
+        """Monitoring configs (shared, read-only)"""
+        return self._generator._generate_monitoring(self.framework)
+    
+    @functools.cached_property
+    def deployment(self) -> Mapping[str, str]:
+        """Deployment configs (shared, read-only)"""
+        return self._generator._generate_deployment(self.framework)
+    
+    @functools.cached_property
+    def ci_cd(self) -> Mapping[str, str]:
+        """CI/CD configs (shared, read-only)"""
+        return self._generator._generate_ci_cd(self.framework)
+    
+    @property
+    def documentation(self) -> str:
+        return self._pooled('documentation', self._build_documentation)
+    
+    @functools.cached_property
+    def health_checks(self) -> str:
+        """Health check module (shared constant)"""
+        return self._generator._generate_health_checks(self.framework)
+    
+    @functools.cached_property
+    def logging_config(self) -> str:
+        """Logging module (shared constant)"""
+        return self._generator._generate_logging(self.framework)
+
+class ProductionReadyGenerator:
+    """
+    Generates production-ready code, not just prototypes
+    
+    This is what separates AI-LA from toys - it generates code
+    that you can actually deploy and maintain in production.
+    """
+    
+    def __init__(self):
+        # (description, framework) -> ProductionCode, oldest first
+        self._packages: Dict[Tuple[str, str], ProductionCode] = {}
+    
+    def generate_production_code(self, description: str, framework: str = "fastapi") -> ProductionCode:
+        """
+        Generate complete production-ready application
+        
+        Takes a description and returns everything needed for production:
+        - Application code
+        - Comprehensive tests
+        - Monitoring setup
+        - Deployment configs
+        - CI/CD pipeline
+        - Documentation
+        
+        Output is deterministic in (description, framework), so results are
+        memoized per generator and repeat calls return the same package.
+        """
+        
+        key = (description, framework)
+        package = self._packages.get(key)
+        if package is not None:
+            return package
+        
+        print(f"Generating production-ready {framework} application...")
+        
+        if len(self._packages) >= PACKAGE_CACHE_SIZE:
+            self._packages.pop(next(iter(self._packages)), None)
+        # Bundles are generated lazily as the caller reads them
+        return self._packages.setdefault(key, ProductionCode(description, framework, self))
+    
+    def _generate_app_code(self, description: str, framework: str) -> str:
+        """Generate production-grade application code"""
+        
+        if framework == "fastapi":
+            # Assemble from sections with a single join - new sections are
+            # appended to the list rather than concatenated onto a string
+            parts = [
+                description.join(_FASTAPI_HEADER_FRAGMENTS),
+                _FASTAPI_MIDDLEWARE,
+                _FASTAPI_PROBES,
+                _FASTAPI_ITEM_MODEL,
+                _FASTAPI_ENDPOINTS,
+            ]
+            return ''.join(parts)
+        
+        return "# Application code for " + framework
+    
+    def _generate_tests(self, description: str, framework: str) -> Mapping[str, str]:
+        """Generate comprehensive test suite"""
+        
+        tests = {}
+        
+        # Unit tests
+        tests['test_unit.py'] = '''"""
+Unit tests for application logic
+"""
+
+import pytest
+from app import app, Item
+from fastapi.testclient import TestClient
+
+client = TestClient(app)
+
+def test_health_check():
+    """Test health check endpoint"""
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+def test_readiness_check():
+    """Test readiness check endpoint"""
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+
+def test_create_item_success():
+    """Test successful item creation"""
+    response = client.post(
+        "/api/items",
+        json={"name": "Test Item", "description": "Test description"}
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["name"] == "Test Item"
+    assert "id" in data
+
+def test_create_item_validation():
+    """Test item creation validation"""
+    response = client.post(
+        "/api/items",
+        json={"name": ""}  # Invalid: empty name
+    )
+    assert response.status_code == 422
+
+def test_list_items():
+    """Test listing items"""
+    response = client.get("/api/items")
+    assert response.status_code == 200
+    data = response.json()
+    assert "items" in data
+    assert "total" in data
+
+def test_get_item():
+    """Test getting specific item"""
+    response = client.get("/api/items/1")
+    assert response.status_code in [200, 404]
+'''
+        
+        # Integration tests
+        tests['test_integration.py'] = '''"""
+Integration tests for API endpoints
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from app import app
+
+client = TestClient(app)
+
+def test_create_and_retrieve_item():
+    """Test creating and retrieving an item"""
+    # Create item
+    create_response = client.post(
+        "/api/items",
+        json={"name": "Integration Test", "description": "Test"}
+    )
+    assert create_response.status_code == 201
+    item_id = create_response.json()["id"]
+    
+    # Retrieve item
+    get_response = client.get(f"/api/items/{item_id}")
+    assert get_response.status_code == 200
+
+def test_api_error_handling():
+    """Test API error handling"""
+    response = client.get("/api/items/99999")
+    assert response.status_code == 404
+'''
+        
+        # Load tests
+        tests['test_load.py'] = '''"""
+Load tests using locust
+"""
+
+from locust import HttpUser, task, between
+
+class APIUser(HttpUser):
+    wait_time = between(1, 3)
+    
+    @task
+    def health_check(self):
+        self.client.get("/health")
+    
+    @task(3)
+    def list_items(self):
+        self.client.get("/api/items")
+    
+    @task(2)
+    def create_item(self):
+        self.client.post(
+            "/api/items",
+            json={"name": "Load Test", "description": "Test"}
+        )
+'''
+        
+        return MappingProxyType(tests)
+    
+    def _generate_monitoring(self, framework: str) -> Mapping[str, str]:
+        """Generate monitoring configuration"""
+        
+        return _MONITORING_CONFIGS
+    
+    def _generate_deployment(self, framework: str) -> Mapping[str, str]:
+        """Generate deployment configurations"""
+        
+        return _DEPLOYMENT_CONFIGS
+    
+    def _generate_ci_cd(self, framework: str) -> Mapping[str, str]:
+        """Generate CI/CD pipeline configurations"""
+        
+        return _CI_CD_CONFIGS
+    
+    def _generate_documentation(self, description: str, framework: str) -> str:
+        """Generate comprehensive documentation"""
+        
+        parts = [
+            _DOCS_HEADER_TMPL.format_map({'description': description, 'framework': framework}),
+            _DOCS_FEATURES,
+            _DOCS_API_ENDPOINTS,
+            _DOCS_OPERATIONS,
+            _DOCS_DEPLOYMENT,
+        ]
+        return ''.join(parts)
+    
+    def _generate_health_checks(self, framework: str) -> str:
+        """Generate health check implementation"""
+        
+        return _HEALTH_CHECKS_PY
+    
+    def _generate_logging(self, framework: str) -> str:
+        """Generate logging configuration"""
+        
+        return _LOGGING_PY
+
 
 # Example usage
 if __name__ == "__main__":
@@ -872,12 +1015,12 @@ if __name__ == "__main__":
     code = generator.generate_production_code(description, "fastapi")
     
     print("Generated:")
-    print(f"- Application code ({len(code.application_code)} chars)")
+    print(f"- Application code ({code.text_length('application_code')} chars)")
     print(f"- {len(code.tests)} test files")
     print(f"- {len(code.monitoring)} monitoring configs")
     print(f"- {len(code.deployment)} deployment configs")
     print(f"- {len(code.ci_cd)} CI/CD configs")
-    print(f"- Documentation ({len(code.documentation)} chars)")
+    print(f"- Documentation ({code.text_length('documentation')} chars)")
     print(f"- Health checks ({len(code.health_checks)} chars)")
     print(f"- Logging config ({len(code.logging_config)} chars)")
     
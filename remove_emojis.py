@@ -1,49 +1,262 @@
 #!/usr/bin/env python3
+import functools
+import hashlib
+import json
+import os
 import re
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Per-file (mtime_ns, size) signatures from the previous run
+CACHE_FILE = '.remove_emojis_cache.json'
+
+# Codepoint ranges treated as emoji (inclusive)
+_EMOJI_RANGES = (
+    (0x1F600, 0x1F64F),  # emoticons
+    (0x1F300, 0x1F5FF),  # symbols & pictographs
+    (0x1F680, 0x1F6FF),  # transport & map symbols
+    (0x1F1E0, 0x1F1FF),  # flags
+    (0x02702, 0x027B0),
+    (0x024C2, 0x1F251),
+    (0x1F900, 0x1F9FF),  # supplemental symbols
+    (0x1FA00, 0x1FAFF),
+)
+
+# Identifies the emoji set a cache was built with; changing _EMOJI_RANGES
+# changes it, which invalidates every cached "already clean" entry
+_RANGES_KEY = hashlib.sha256(repr(_EMOJI_RANGES).encode()).hexdigest()
+
+# Any UTF-8 lead byte that can start a codepoint >= U+2000
+_HIGH_LEAD_BYTE_RE = re.compile(b'[\xe2-\xf4]')
+
+def _merge_ranges(ranges):
+    """Sort and coalesce overlapping or adjacent codepoint ranges"""
+    merged = []
+    for lo, hi in sorted(ranges):
+        if merged and lo <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return merged
+
+def _utf8_sequences(lo, hi):
+    """
+    Split codepoints lo..hi into runs whose UTF-8 encodings are a fixed
+    product of byte ranges, yielding [(first_byte_lo, first_byte_hi), ...]
+    """
+    # Surrogates have no valid UTF-8 encoding
+    if lo <= 0xDFFF and hi >= 0xD800:
+        if lo < 0xD800:
+            yield from _utf8_sequences(lo, 0xD7FF)
+        if hi > 0xDFFF:
+            yield from _utf8_sequences(0xE000, hi)
+        return
+    
+    # Keep each run within one encoded length
+    for boundary in (0x7F, 0x7FF, 0xFFFF):
+        if lo <= boundary < hi:
+            yield from _utf8_sequences(lo, boundary)
+            yield from _utf8_sequences(boundary + 1, hi)
+            return
+    
+    # Align on continuation-byte boundaries so every byte position varies independently
+    length = len(chr(lo).encode('utf-8'))
+    for i in range(1, length):
+        mask = (1 << (6 * i)) - 1
+        if lo & ~mask != hi & ~mask:
+            if lo & mask:
+                yield from _utf8_sequences(lo, lo | mask)
+                yield from _utf8_sequences((lo | mask) + 1, hi)
+                return
+            if hi & mask != mask:
+                yield from _utf8_sequences(lo, (hi & ~mask) - 1)
+                yield from _utf8_sequences(hi & ~mask, hi)
+                return
+    
+    yield list(zip(chr(lo).encode('utf-8'), chr(hi).encode('utf-8')))
+
+def _utf8_bytes_alternatives(ranges):
+    """Byte regex alternatives, one per UTF-8 run covering the given ranges"""
+    alternatives = []
+    for lo, hi in _merge_ranges(ranges):
+        for sequence in _utf8_sequences(lo, hi):
+            alternatives.append(''.join(
+                f'\\x{a:02x}' if a == b else f'[\\x{a:02x}-\\x{b:02x}]'
+                for a, b in sequence))
+    return alternatives
+
+# The same emoji set as remove_emojis(), expressed over raw UTF-8 bytes so files can
+# be cleaned without a decode/encode round trip
+_EMOJI_BYTES_PATTERN = '(?:' + '|'.join(_utf8_bytes_alternatives(_EMOJI_RANGES)) + ')'
+_EMOJI_BYTES_RE = re.compile((_EMOJI_BYTES_PATTERN + '+').encode('ascii'))
+
+try:
+    import hyperscan
+except ImportError:
+    # hyperscan is optional - clean_file falls back to _EMOJI_BYTES_RE
+    hyperscan = None
+    _EMOJI_HS_DB = None
+else:
+    # One emoji codepoint per match; the lead byte of every alternative is
+    # >= 0xE2 and never a continuation byte, so reported spans can't overlap
+    _EMOJI_HS_DB = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    _EMOJI_HS_DB.compile(
+        expressions=[_EMOJI_BYTES_PATTERN.encode('ascii')],
+        ids=[0],
+        flags=[hyperscan.HS_FLAG_SOM_LEFTMOST])
+
+def _strip_emoji_bytes(raw):
+    """Remove emoji from UTF-8 bytes, using the hyperscan DFA when available"""
+    if _EMOJI_HS_DB is None:
+        return _EMOJI_BYTES_RE.sub(b'', raw)
+    
+    spans = []
+    def on_match(pattern_id, start, end, flags, context):
+        spans.append((start, end))
+    _EMOJI_HS_DB.scan(raw, match_event_handler=on_match)
+    
+    if not spans:
+        return raw
+    
+    parts = []
+    pos = 0
+    for start, end in spans:
+        parts.append(raw[pos:start])
+        pos = end
+    parts.append(raw[pos:])
+    return b''.join(parts)
+
+@functools.lru_cache(maxsize=None)
+def _emoji_delete_table():
+    """str.translate table mapping every emoji codepoint to None (built on first use)"""
+    return {cp: None for lo, hi in _merge_ranges(_EMOJI_RANGES) for cp in range(lo, hi + 1)}
+
 def remove_emojis(text):
     """Remove all emojis from text"""
-    # Comprehensive emoji pattern
-    emoji_pattern = re.compile("["
-        u"\U0001F600-\U0001F64F"  # emoticons
-        u"\U0001F300-\U0001F5FF"  # symbols & pictographs
-        u"\U0001F680-\U0001F6FF"  # transport & map symbols
-        u"\U0001F1E0-\U0001F1FF"  # flags
-        u"\U00002702-\U000027B0"
-        u"\U000024C2-\U0001F251"
-        u"\U0001F900-\U0001F9FF"  # supplemental symbols
-        u"\U0001FA00-\U0001FAFF"
-        "]+", flags=re.UNICODE)
-    return emoji_pattern.sub('', text)
+    if text.isascii():
+        return text
+    return text.translate(_emoji_delete_table())
+
+def _atomic_write(filepath, data):
+    """Write via a unique temp file and os.replace so a crash never leaves a partial file"""
+    # Replace the file a symlink points at, not the link itself
+    target = os.path.realpath(filepath)
+    if os.stat(target).st_nlink > 1:
+        # Renaming over a hardlink would split it from its other names
+        with open(target, 'r+b') as f:
+            f.write(data)
+            f.truncate()
+        return
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target),
+                               prefix='.' + os.path.basename(target) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        shutil.copymode(target, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
 
 def clean_file(filepath):
-    """Remove emojis from a file"""
+    """Remove emojis from a file; True if cleaned, False if unchanged, None on error"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(filepath, 'rb') as f:
+            raw = f.read()
         
-        cleaned = remove_emojis(content)
+        # Every emoji range starts at U+24C2 or above, which UTF-8 encodes with
+        # a lead byte of 0xE2 or higher - without one there is nothing to strip
+        if not _HIGH_LEAD_BYTE_RE.search(raw):
+            return False
         
-        if cleaned != content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(cleaned)
+        cleaned = _strip_emoji_bytes(raw)
+        
+        if cleaned != raw:
+            _atomic_write(Path(filepath), cleaned)
             print(f"Cleaned: {filepath}")
             return True
         return False
     except Exception as e:
         print(f"Error cleaning {filepath}: {e}")
-        return False
+        return None
 
-# Find and clean all Python and Markdown files
-root = Path('.')
-count = 0
+def _is_skipped(name):
+    """Whether a path component belongs to git metadata or bytecode caches"""
+    return '.git' in name or '__pycache__' in name
+
+def _file_signature(filepath):
+    """(mtime_ns, size) used to tell whether a file changed since the last run"""
+    st = os.stat(filepath)
+    return [st.st_mtime_ns, st.st_size]
+
+def _load_cache():
+    """Load the per-file signatures recorded by the previous run with the same emoji set"""
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('ranges') != _RANGES_KEY:
+        return {}
+    return data.get('files', {})
+
+def _save_cache(cache):
+    """Persist per-file signatures for the next run"""
+    try:
+        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'ranges': _RANGES_KEY, 'files': cache}, f)
+    except OSError as e:
+        print(f"Could not write {CACHE_FILE}: {e}")
 
-for pattern in ['**/*.py', '**/*.md']:
-    for filepath in root.glob(pattern):
-        if '.git' not in str(filepath) and '__pycache__' not in str(filepath):
-            if clean_file(filepath):
-                count += 1
+def main():
+    """Find and clean all Python and Markdown files"""
+    # One walk for both extensions; skipped directories are pruned in place
+    # so their subtrees are never listed
+    paths = []
+    for dirpath, dirnames, filenames in os.walk('.'):
+        dirnames[:] = [d for d in dirnames if not _is_skipped(d)]
+        for filename in filenames:
+            if filename.endswith(('.py', '.md')) and not _is_skipped(filename):
+                paths.append(Path(dirpath, filename))
+    
+    # Skip files that haven't changed since they were last scanned. The new
+    # cache is rebuilt from this walk, so deleted or renamed files drop out
+    old_cache = _load_cache()
+    cache = {}
+    pending = []
+    for filepath in paths:
+        try:
+            signature = _file_signature(filepath)
+        except OSError:
+            continue
+        if old_cache.get(str(filepath)) == signature:
+            cache[str(filepath)] = signature
+        else:
+            pending.append(filepath)
+    
+    # Files are independent, so spread decode + strip + write across cores
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(clean_file, pending, chunksize=32))
+    count = sum(1 for result in results if result)
+    
+    # Record post-clean signatures so the next run is stat-only for these files;
+    # files that failed (result None) stay uncached and are retried next run
+    for filepath, result in zip(pending, results):
+        if result is None:
+            continue
+        try:
+            cache[str(filepath)] = _file_signature(filepath)
+        except OSError:
+            pass
+    _save_cache(cache)
+    
+    print(f"\nCleaned {count} files")
 
-print(f"\nCleaned {count} files")
+if __name__ == "__main__":
+    main()
@@ -11,19 +11,91 @@ from typing import Dict, List
 from datetime import datetime
 import subprocess
 
+from db_connections import close_at_exit, connect_reader, connect_writer, forget_at_exit
+
+# Architecture-pattern successes are counted in memory and written out
+# after this many successful builds (or before any read / on close). Until
+# then they are invisible to other processes, such as the patterns CLI, and
+# a hard crash loses up to PATTERN_FLUSH_EVERY - 1 builds' worth of them
+PATTERN_FLUSH_EVERY = 32
+
+
 class SelfEvolutionEngine:
     """
     Learns from execution history and improves future builds
     """
     
+    # Frequently run SQL lives in constants, so the statement cache sees
+    # identical text on every call
+    _INSERT_BUILD_SQL = '''
+        INSERT INTO builds (
+            timestamp, description, task_type, tech_stack,
+            success, duration_seconds, code_quality_score,
+            test_pass_rate, deployment_success
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    _CREATE_PATTERN_KEY_SQL = '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_patterns_key
+        ON patterns(pattern_type, context, solution)
+    '''
+    _UPSERT_PATTERN_SQL = '''
+        INSERT INTO patterns (
+            pattern_type, context, solution,
+            success_count, failure_count, confidence_score, last_used
+        ) VALUES (?, ?, ?, ?, 0, 1.0, ?)
+        ON CONFLICT(pattern_type, context, solution) DO UPDATE
+        SET success_count = success_count + excluded.success_count,
+            confidence_score = (success_count + excluded.success_count * 1.0)
+                             / (success_count + failure_count + excluded.success_count),
+            last_used = excluded.last_used
+    '''
+    _INSERT_CODE_PATTERN_SQL = '''
+        INSERT OR IGNORE INTO patterns (
+            pattern_type, context, solution,
+            success_count, failure_count, confidence_score, last_used
+        ) VALUES (?, ?, ?, 1, 0, 1.0, ?)
+    '''
+    _SELECT_PATTERN_SQL = '''
+        SELECT solution, confidence_score
+        FROM patterns
+        WHERE pattern_type = ? AND context = ?
+        ORDER BY confidence_score DESC, success_count DESC
+        LIMIT 1
+    '''
+    
     def __init__(self):
         self.db_path = Path.home() / ".ai-coding-stack" / "evolution.db"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Pending architecture-pattern successes:
+        # (pattern_type, context, solution) -> [success delta, last_used];
+        # set before connecting so close() works on a half-built instance
+        self._pattern_cache = {}
+        self._builds_since_flush = 0
+        # Reused across calls so SQLite's page and statement caches stay warm
+        self._conn = connect_writer(self.db_path)
         self._init_database()
+        # Read-only connection for the statistics/suggestion queries
+        self._reader = connect_reader(self.db_path)
+        close_at_exit(self)
+    
+    def close(self):
+        """Write pending pattern counts and close the database connections"""
+        if getattr(self, '_conn', None) is None:
+            return
+        forget_at_exit(self)
+        self.flush_patterns()
+        for name in ('_reader', '_conn'):
+            conn = getattr(self, name, None)
+            setattr(self, name, None)
+            if conn is not None:
+                conn.close()
+    
+    def __del__(self):
+        self.close()
     
     def _init_database(self):
         """Initialize SQLite database for learning"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         c = conn.cursor()
         
         # Build history table
@@ -68,21 +140,76 @@ class SelfEvolutionEngine:
             )
         ''')
         
+        # Cover the pattern lookup in get_best_pattern and the failure grouping
+        # in get_improvement_suggestions
+        c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_patterns_lookup
+            ON patterns(pattern_type, context, confidence_score DESC, success_count DESC)
+        ''')
+        c.execute('''
+            CREATE INDEX IF NOT EXISTS idx_builds_task
+            ON builds(task_type, tech_stack, success)
+        ''')
+        
+        # One row per (pattern_type, context, solution); conflict target for
+        # the upsert in extract_patterns
+        try:
+            c.execute(self._CREATE_PATTERN_KEY_SQL)
+        except sqlite3.IntegrityError:
+            self._merge_duplicate_patterns(c)
+            c.execute(self._CREATE_PATTERN_KEY_SQL)
+        
         conn.commit()
-        conn.close()
+    
+    def _merge_duplicate_patterns(self, c):
+        """Fold duplicate patterns from older databases into their oldest row"""
+        # Correlated subqueries rather than UPDATE ... FROM, which needs SQLite 3.33+
+        c.execute('''
+            UPDATE patterns
+            SET success_count = (
+                    SELECT SUM(dup.success_count) FROM patterns AS dup
+                    WHERE dup.pattern_type = patterns.pattern_type
+                      AND dup.context = patterns.context
+                      AND dup.solution = patterns.solution),
+                failure_count = (
+                    SELECT SUM(dup.failure_count) FROM patterns AS dup
+                    WHERE dup.pattern_type = patterns.pattern_type
+                      AND dup.context = patterns.context
+                      AND dup.solution = patterns.solution),
+                confidence_score = (
+                    SELECT SUM(dup.success_count) * 1.0
+                           / MAX(SUM(dup.success_count) + SUM(dup.failure_count), 1)
+                    FROM patterns AS dup
+                    WHERE dup.pattern_type = patterns.pattern_type
+                      AND dup.context = patterns.context
+                      AND dup.solution = patterns.solution),
+                last_used = (
+                    SELECT MAX(dup.last_used) FROM patterns AS dup
+                    WHERE dup.pattern_type = patterns.pattern_type
+                      AND dup.context = patterns.context
+                      AND dup.solution = patterns.solution)
+            WHERE id IN (
+                SELECT MIN(id) FROM patterns
+                WHERE pattern_type IS NOT NULL AND context IS NOT NULL AND solution IS NOT NULL
+                GROUP BY pattern_type, context, solution
+                HAVING COUNT(*) > 1
+            )
+        ''')
+        c.execute('''
+            DELETE FROM patterns
+            WHERE id NOT IN (
+                SELECT MIN(id) FROM patterns
+                GROUP BY pattern_type, context, solution
+            )
+            AND pattern_type IS NOT NULL AND context IS NOT NULL AND solution IS NOT NULL
+        ''')
     
     def record_build(self, build_data: Dict) -> int:
         """Record a build execution"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         c = conn.cursor()
         
-        c.execute('''
-            INSERT INTO builds (
-                timestamp, description, task_type, tech_stack,
-                success, duration_seconds, code_quality_score,
-                test_pass_rate, deployment_success
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        c.execute(self._INSERT_BUILD_SQL, (
             datetime.now().isoformat(),
             build_data.get('description'),
             build_data.get('task_type'),
@@ -96,7 +223,6 @@ class SelfEvolutionEngine:
         
         build_id = c.lastrowid
         conn.commit()
-        conn.close()
         
         return build_id
     
@@ -105,7 +231,7 @@ class SelfEvolutionEngine:
         if not build_data.get('success'):
             return
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         c = conn.cursor()
         
         # Extract architecture patterns
@@ -117,66 +243,59 @@ class SelfEvolutionEngine:
             })
             solution = json.dumps(build_data['architecture'])
             
-            # Check if pattern exists
-            c.execute('''
-                SELECT id, success_count FROM patterns
-                WHERE pattern_type = ? AND context = ? AND solution = ?
-            ''', (pattern_type, context, solution))
-            
-            existing = c.fetchone()
-            
-            if existing:
-                # Update existing pattern
-                c.execute('''
-                    UPDATE patterns
-                    SET success_count = success_count + 1,
-                        confidence_score = (success_count + 1.0) / (success_count + failure_count + 1.0),
-                        last_used = ?
-                    WHERE id = ?
-                ''', (datetime.now().isoformat(), existing[0]))
-            else:
-                # Create new pattern
-                c.execute('''
-                    INSERT INTO patterns (
-                        pattern_type, context, solution,
-                        success_count, failure_count, confidence_score, last_used
-                    ) VALUES (?, ?, ?, 1, 0, 1.0, ?)
-                ''', (pattern_type, context, solution, datetime.now().isoformat()))
+            # Count another success in memory; flush_patterns() creates or updates the row
+            entry = self._pattern_cache.setdefault((pattern_type, context, solution), [0, None])
+            entry[0] += 1
+            entry[1] = datetime.now().isoformat()
         
         # Extract code patterns
         if 'code_patterns' in build_data:
-            for pattern in build_data['code_patterns']:
-                pattern_type = "code"
-                context = json.dumps(pattern.get('context', {}))
-                solution = pattern.get('solution', '')
-                
-                c.execute('''
-                    INSERT OR IGNORE INTO patterns (
-                        pattern_type, context, solution,
-                        success_count, failure_count, confidence_score, last_used
-                    ) VALUES (?, ?, ?, 1, 0, 1.0, ?)
-                ''', (pattern_type, context, solution, datetime.now().isoformat()))
+            now = datetime.now().isoformat()
+            c.executemany(self._INSERT_CODE_PATTERN_SQL, [
+                ("code", json.dumps(pattern.get('context', {})), pattern.get('solution', ''), now)
+                for pattern in build_data['code_patterns']
+            ])
         
         conn.commit()
-        conn.close()
+        
+        self._builds_since_flush += 1
+        if self._builds_since_flush >= PATTERN_FLUSH_EVERY:
+            self.flush_patterns()
+    
+    def flush_patterns(self):
+        """
+        Upsert the in-memory architecture-pattern counts in one transaction
+        
+        Runs every PATTERN_FLUSH_EVERY builds, before reads, on close() and at
+        exit; counts still pending when the process is killed are lost.
+        """
+        self._builds_since_flush = 0
+        if not self._pattern_cache:
+            return
+        
+        conn = self._conn
+        try:
+            conn.executemany(self._UPSERT_PATTERN_SQL, [
+                (pattern_type, context, solution, successes, last_used)
+                for (pattern_type, context, solution), (successes, last_used)
+                in self._pattern_cache.items()
+            ])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        self._pattern_cache.clear()
     
     def get_best_pattern(self, pattern_type: str, context: Dict) -> Dict:
         """Retrieve the best matching pattern"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+        self.flush_patterns()
+        c = self._conn.cursor()
         
         context_json = json.dumps(context)
         
-        c.execute('''
-            SELECT solution, confidence_score
-            FROM patterns
-            WHERE pattern_type = ? AND context = ?
-            ORDER BY confidence_score DESC, success_count DESC
-            LIMIT 1
-        ''', (pattern_type, context_json))
+        c.execute(self._SELECT_PATTERN_SQL, (pattern_type, context_json))
         
         result = c.fetchone()
-        conn.close()
         
         if result:
             return {
@@ -186,14 +305,28 @@ class SelfEvolutionEngine:
         
         return None
     
-    def get_improvement_suggestions(self) -> List[Dict]:
-        """Analyze history and suggest improvements"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+    def get_improvement_suggestions(self, kinds=None) -> List[Dict]:
+        """
+        Analyze history and suggest improvements
+        
+        kinds limits the result to the given suggestion types
+        ("avoid_combination", "use_pattern"); queries and JSON decoding for
+        the other types are skipped.
+        """
+        self.flush_patterns()
+        c = self._reader.cursor()
         
         suggestions = []
         
-        # Analyze failure patterns
+        if kinds is None or "avoid_combination" in kinds:
+            self._add_failure_suggestions(c, suggestions)
+        if kinds is None or "use_pattern" in kinds:
+            self._add_pattern_suggestions(c, suggestions)
+        
+        return suggestions
+    
+    def _add_failure_suggestions(self, c, suggestions: List[Dict]):
+        """Append avoid_combination suggestions for repeatedly failing task/stack pairs"""
         c.execute('''
             SELECT task_type, tech_stack, COUNT(*) as failures
             FROM builds
@@ -210,8 +343,9 @@ class SelfEvolutionEngine:
                 "reason": f"Failed {row[2]} times",
                 "priority": "high"
             })
-        
-        # Find high-success patterns
+    
+    def _add_pattern_suggestions(self, c, suggestions: List[Dict]):
+        """Append use_pattern suggestions for high-confidence patterns"""
         c.execute('''
             SELECT pattern_type, context, solution, confidence_score
             FROM patterns
@@ -229,9 +363,6 @@ class SelfEvolutionEngine:
                 "confidence": row[3],
                 "priority": "medium"
             })
-        
-        conn.close()
-        return suggestions
     
     def optimize_for_task(self, task: Dict) -> Dict:
         """Optimize task based on learned patterns"""
@@ -246,8 +377,8 @@ class SelfEvolutionEngine:
             task['optimization_applied'] = True
             task['optimization_confidence'] = arch_pattern['confidence']
         
-        # Get improvement suggestions
-        suggestions = self.get_improvement_suggestions()
+        # Get improvement suggestions; only failed combinations are applied here
+        suggestions = self.get_improvement_suggestions(kinds=("avoid_combination",))
         
         # Apply high-priority suggestions
         for suggestion in suggestions:
@@ -261,38 +392,31 @@ class SelfEvolutionEngine:
     
     def get_statistics(self) -> Dict:
         """Get evolution statistics"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        # Total builds
-        c.execute('SELECT COUNT(*) FROM builds')
-        total_builds = c.fetchone()[0]
-        
-        # Success rate
-        c.execute('SELECT AVG(success) FROM builds')
-        success_rate = c.fetchone()[0] or 0
+        self.flush_patterns()
+        c = self._reader.cursor()
         
-        # Average quality score
-        c.execute('SELECT AVG(code_quality_score) FROM builds WHERE success = 1')
-        avg_quality = c.fetchone()[0] or 0
+        # Totals, success rate, quality and early/recent success in one scan;
+        # the midpoint id is computed once instead of per row
+        c.execute('''
+            WITH m AS (SELECT MAX(id) / 2 AS midpoint FROM builds)
+            SELECT
+                COUNT(*),
+                AVG(success),
+                AVG(CASE WHEN success = 1 THEN code_quality_score END),
+                AVG(CASE WHEN id <= m.midpoint THEN success END) as early_success,
+                AVG(CASE WHEN id > m.midpoint THEN success END) as recent_success
+            FROM builds, m
+        ''')
+        total_builds, success_rate, avg_quality, early, recent = c.fetchone()
+        success_rate = success_rate or 0
+        avg_quality = avg_quality or 0
         
         # Learned patterns
         c.execute('SELECT COUNT(*) FROM patterns WHERE confidence_score > 0.7')
         high_confidence_patterns = c.fetchone()[0]
         
-        # Improvement over time
-        c.execute('''
-            SELECT 
-                AVG(CASE WHEN id <= (SELECT MAX(id)/2 FROM builds) THEN success ELSE NULL END) as early_success,
-                AVG(CASE WHEN id > (SELECT MAX(id)/2 FROM builds) THEN success ELSE NULL END) as recent_success
-            FROM builds
-        ''')
-        early, recent = c.fetchone()
-        
         improvement = ((recent or 0) - (early or 0)) * 100 if early and recent else 0
         
-        conn.close()
-        
         return {
             "total_builds": total_builds,
             "success_rate": round(success_rate * 100, 1),
@@ -330,31 +454,34 @@ def main():
     
     elif command == "suggestions":
         suggestions = engine.get_improvement_suggestions()
-        print("\n Improvement Suggestions\n")
+        # Collected and written with a single print
+        lines = ["\n Improvement Suggestions\n"]
         for i, sug in enumerate(suggestions, 1):
-            print(f"{i}. [{sug['priority'].upper()}] {sug['type']}")
+            lines.append(f"{i}. [{sug['priority'].upper()}] {sug['type']}")
             if sug['type'] == 'avoid_combination':
-                print(f"   Reason: {sug['reason']}")
+                lines.append(f"   Reason: {sug['reason']}")
             elif sug['type'] == 'use_pattern':
-                print(f"   Confidence: {sug['confidence']:.0%}")
-            print()
+                lines.append(f"   Confidence: {sug['confidence']:.0%}")
+            lines.append("")
+        print("\n".join(lines))
     
     elif command == "patterns":
-        conn = sqlite3.connect(engine.db_path)
-        c = conn.cursor()
+        engine.flush_patterns()
+        c = engine._reader.cursor()
         c.execute('''
             SELECT pattern_type, confidence_score, success_count
             FROM patterns
-            ORDER BY confidence_score DESC
+            ORDER BY confidence_score DESC, id
             LIMIT 10
         ''')
         
-        print("\n Learned Patterns (Top 10)\n")
-        for row in c.fetchall():
-            print(f"• {row[0]}: {row[2]} successes, {row[1]:.0%} confidence")
-        print()
-        
-        conn.close()
+        lines = ["\n Learned Patterns (Top 10)\n"]
+        lines.extend(f"• {row[0]}: {row[2]} successes, {row[1]:.0%} confidence"
+                     for row in c.fetchall())
+        lines.append("")
+        print("\n".join(lines))
+    
+    engine.close()
 
 
 if __name__ == "__main__":
@@ -6,11 +6,111 @@ Cryptographic receipt system for AI operations
 
 import hashlib
 import json
+import queue
+import struct
+import threading
 import time
+import warnings
+from concurrent.futures import Future
 from datetime import datetime
 from pathlib import Path
 import sqlite3
 
+from db_connections import close_at_exit, connect_reader, connect_writer, forget_at_exit
+
+try:
+    from blake3 import blake3
+except ImportError:
+    # blake3 is optional - only needed for TECPCore(hash_algorithm='blake3')
+    blake3 = None
+
+# Hash constructors selectable with TECPCore(hash_algorithm=...)
+HASH_ALGORITHMS = {'sha256': hashlib.sha256}
+if blake3 is not None:
+    HASH_ALGORITHMS['blake3'] = blake3
+
+# Receipt fields covered by receipt_hash. Only stored columns are included so
+# verify_receipt can recompute the hash from a database row.
+RECEIPT_HASH_FIELDS = ('chain_index', 'input_hash', 'operation_data', 'operation_type',
+                       'output_hash', 'previous_hash', 'timestamp')
+
+# previous_hash of the first receipt in a chain
+GENESIS_HASH = bytes(32)
+
+# Verification log rows are buffered and written in groups of this size
+VERIFY_LOG_FLUSH_EVERY = 256
+
+# Most ops the asynchronous recorder writes per transaction
+ASYNC_BATCH_SIZE = 256
+
+# Batches at least this large refresh the query planner's statistics
+ANALYZE_BATCH_SIZE = 1000
+
+_pack_count = struct.Struct('<Q').pack
+_pack_int = struct.Struct('<q').pack
+_pack_float = struct.Struct('<d').pack
+
+def _canon(value):
+    """
+    Canonical bytes for a hashed value: a one-byte type tag followed by a
+    fixed-width or length-prefixed payload, so distinct values never collide
+    """
+    if isinstance(value, str):
+        data = value.encode()
+        return b'S' + _pack_count(len(data)) + data
+    if isinstance(value, bool):
+        return b'T' if value else b'F'
+    if isinstance(value, int):
+        if -2**63 <= value < 2**63:
+            return b'I' + _pack_int(value)
+        data = str(value).encode()
+        return b'N' + _pack_count(len(data)) + data
+    if isinstance(value, float):
+        return b'D' + _pack_float(value)
+    if value is None:
+        return b'Z'
+    if isinstance(value, bytes):
+        return b'B' + _pack_count(len(value)) + value
+    if isinstance(value, dict):
+        items = sorted((_canon(k), _canon(v)) for k, v in value.items())
+        return b'M' + _pack_count(len(items)) + b''.join(k + v for k, v in items)
+    if isinstance(value, (list, tuple)):
+        return b'L' + _pack_count(len(value)) + b''.join(_canon(v) for v in value)
+    return _canon(str(value))
+
+
+# Encoded map header and field names in _canon()'s key order, so serializing
+# a receipt never re-encodes or re-sorts keys
+_RECEIPT_HEADER = b'M' + _pack_count(len(RECEIPT_HASH_FIELDS))
+_RECEIPT_FIELD_PREFIXES = tuple(
+    (field, prefix) for prefix, field in sorted((_canon(f), f) for f in RECEIPT_HASH_FIELDS))
+
+def _receipt_bytes(receipt_data):
+    """
+    Serialized hash input for a receipt - _canon() of its RECEIPT_HASH_FIELDS
+    as a map, built in one join
+    """
+    parts = [_RECEIPT_HEADER]
+    for field, prefix in _RECEIPT_FIELD_PREFIXES:
+        parts += (prefix, _canon(receipt_data[field]))
+    return b''.join(parts)
+
+
+def _hash_to_blob(value):
+    """Stored form of a hash: 32 raw bytes (hex strings from older rows are decoded)"""
+    if isinstance(value, str):
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _hash_to_hex(value):
+    """API form of a stored hash: 64-char lowercase hex"""
+    return value.hex() if isinstance(value, bytes) else value
+
+
 class TECPCore:
     """
     TECP Core - Cryptographic Receipt System
@@ -22,35 +122,156 @@ class TECPCore:
     - Complete audit trail with zero-knowledge proofs
     """
     
-    def __init__(self, db_path="tecp_receipts.db"):
+    # Hot statements, kept as constants so the connection's statement cache
+    # keys on the same text every call
+    _INSERT_RECEIPT_SQL = '''INSERT INTO receipts 
+                             (timestamp, operation_type, operation_data, input_hash, 
+                              output_hash, receipt_hash, previous_hash, chain_index)
+                             VALUES (?, ?, ?, ?, ?, ?, ?, ?)'''
+    _SELECT_RECEIPT_SQL = 'SELECT * FROM receipts WHERE receipt_hash = ?'
+    _SELECT_HASH_AT_SQL = 'SELECT receipt_hash FROM receipts WHERE chain_index = ?'
+    _INSERT_VERIFICATION_SQL = '''INSERT INTO verification_log (timestamp, receipt_id, verified, verifier)
+                                  VALUES (?, ?, ?, ?)'''
+    # Links into receipts after a chain index that are valid (previous_hash
+    # matches the predecessor's receipt_hash), found via idx_receipts_chain
+    _COUNT_VALID_LINKS_SQL = '''SELECT COALESCE(SUM(a.previous_hash = b.receipt_hash), 0)
+                                FROM receipts a
+                                JOIN receipts b ON b.chain_index = a.chain_index - 1
+                                WHERE a.chain_index > ?'''
+    _SELECT_CHECKPOINT_SQL = '''SELECT
+                                    (SELECT value FROM chain_meta WHERE key = 'verified_through_index'),
+                                    (SELECT value FROM chain_meta WHERE key = 'valid_links')'''
+    _SELECT_CHAIN_SQL = '''SELECT * FROM receipts WHERE chain_index >= ? 
+                           ORDER BY chain_index LIMIT ?'''
+    
+    def __init__(self, db_path="tecp_receipts.db", hash_algorithm='sha256'):
+        if hash_algorithm not in HASH_ALGORITHMS:
+            raise ValueError(f"Unsupported hash algorithm: {hash_algorithm} "
+                             f"(available: {', '.join(HASH_ALGORITHMS)})")
         self.db_path = db_path
+        self.hash_algorithm = hash_algorithm
+        self._new_hash = HASH_ALGORITHMS[hash_algorithm]
+        # Verification results waiting to be written to verification_log;
+        # set before connecting so close() works on a half-built instance
+        self._verify_log_buffer = []
+        self._verify_log_flush_every = VERIFY_LOG_FLUSH_EVERY
+        # One long-lived connection keeps the page and statement caches warm;
+        # the lock serializes callers that share this instance across threads
+        self._lock = threading.RLock()
+        self._conn = connect_writer(db_path, check_same_thread=False)
         self.init_database()
+        if db_path in (':memory:', ''):
+            # Private databases can't be opened a second time - read through
+            # the writer connection, under the writer lock
+            self._read_lock = self._lock
+            self._reader = self._conn
+        else:
+            # Read-only connection for the audit/stat queries, so they never wait
+            # on the writer lock; WAL lets it read while receipts are being written
+            self._read_lock = threading.Lock()
+            self._reader = connect_reader(db_path, check_same_thread=False)
+        # Chain head (last receipt hash, last chain index), advanced on every insert
+        self._last_hash, self._last_index = self._load_chain_head()
+        close_at_exit(self)
+    
+    def close(self):
+        """Flush the verification log and close the database connections"""
+        if getattr(self, '_conn', None) is None:
+            return
+        forget_at_exit(self)
+        self.flush_verification_log()
+        conn, self._conn = self._conn, None
+        conn.close()
+        reader, self._reader = getattr(self, '_reader', None), None
+        if reader is not None and reader is not conn:
+            reader.close()
+    
+    def __del__(self):
+        self.close()
     
     def init_database(self):
         """Initialize TECP receipt database"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS receipts
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      timestamp REAL,
-                      operation_type TEXT,
-                      operation_data TEXT,
-                      input_hash TEXT,
-                      output_hash TEXT,
-                      receipt_hash TEXT,
-                      previous_hash TEXT,
-                      chain_index INTEGER)''')
-        
-        c.execute('''CREATE TABLE IF NOT EXISTS verification_log
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      timestamp REAL,
-                      receipt_id INTEGER,
-                      verified BOOLEAN,
-                      verifier TEXT)''')
+        with self._lock:
+            conn = self._conn
+            c = conn.cursor()
+            
+            c.execute('''CREATE TABLE IF NOT EXISTS receipts
+                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                          timestamp REAL,
+                          operation_type TEXT,
+                          operation_data TEXT,
+                          input_hash TEXT,
+                          output_hash TEXT,
+                          receipt_hash BLOB,
+                          previous_hash BLOB,
+                          chain_index INTEGER)''')
+            
+            c.execute('''CREATE TABLE IF NOT EXISTS verification_log
+                         (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                          timestamp REAL,
+                          receipt_id INTEGER,
+                          verified BOOLEAN,
+                          verifier TEXT)''')
+            
+            # Integrity checkpoint: links up to verified_through_index have
+            # been checked, and valid_links of them matched
+            c.execute('''CREATE TABLE IF NOT EXISTS chain_meta
+                         (key TEXT PRIMARY KEY,
+                          value INTEGER)''')
+            
+            self._migrate_hex_hashes(c)
+            
+            # Point lookups for verify_receipt and range scans for get_receipt_chain
+            self._create_index(c, 'idx_receipts_hash', 'receipts', 'receipt_hash')
+            # A unique chain index is what makes a stale cached chain head fail
+            # with IntegrityError; without it the head is re-read every batch
+            self._chain_index_unique = self._create_index(
+                c, 'idx_receipts_chain', 'receipts', 'chain_index')
+            if not self._chain_index_unique:
+                warnings.warn(f"{self.db_path}: receipts has duplicate chain_index values, so "
+                              f"idx_receipts_chain is not unique; the chain head will be "
+                              f"re-read for every batch", RuntimeWarning, stacklevel=3)
+            
+            self._init_checkpoint(c)
+            
+            conn.commit()
+    
+    def _init_checkpoint(self, c):
+        """Seed the integrity checkpoint with one full-chain check if it's missing"""
+        c.execute(self._SELECT_CHECKPOINT_SQL)
+        if c.fetchone()[0] is not None:
+            return
         
-        conn.commit()
-        conn.close()
+        c.execute('SELECT MAX(chain_index) FROM receipts')
+        through = c.fetchone()[0]
+        through = -1 if through is None else through
+        c.execute(self._COUNT_VALID_LINKS_SQL, (-1,))
+        valid_links = c.fetchone()[0]
+        c.executemany('INSERT OR REPLACE INTO chain_meta (key, value) VALUES (?, ?)',
+                      [('verified_through_index', through), ('valid_links', valid_links)])
+    
+    def _migrate_hex_hashes(self, c):
+        """Convert hashes stored as 64-char hex TEXT by older versions to 32-byte BLOBs"""
+        c.execute("""SELECT id, receipt_hash, previous_hash FROM receipts
+                     WHERE typeof(receipt_hash) = 'text' OR typeof(previous_hash) = 'text'""")
+        rows = c.fetchall()
+        if rows:
+            c.executemany('UPDATE receipts SET receipt_hash = ?, previous_hash = ? WHERE id = ?',
+                          [(_hash_to_blob(receipt_hash), _hash_to_blob(previous_hash), row_id)
+                           for row_id, receipt_hash, previous_hash in rows])
+    
+    def _create_index(self, c, name, table, column):
+        """
+        Create a unique index, or a plain one if existing rows already collide.
+        Returns whether the index is unique.
+        """
+        try:
+            c.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {table}({column})')
+        except sqlite3.IntegrityError:
+            c.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {table}({column})')
+        # A plain index left by an earlier run keeps the name, so ask SQLite
+        c.execute('SELECT "unique" FROM pragma_index_list(?) WHERE name = ?', (table, name))
+        return bool(c.fetchone()[0])
     
     def generate_receipt(self, operation_type, operation_data, input_data, output_data):
         """
@@ -59,36 +280,72 @@ class TECPCore:
         Returns:
             dict: Receipt with cryptographic proof
         """
-        timestamp = time.time()
-        
-        # Hash input and output
-        input_hash = self._hash_data(input_data)
-        output_hash = self._hash_data(output_data)
-        
-        # Get previous receipt hash for chaining
-        previous_hash = self._get_last_receipt_hash()
-        chain_index = self._get_next_chain_index()
-        
-        # Create receipt data
-        receipt_data = {
-            'timestamp': timestamp,
-            'datetime': datetime.fromtimestamp(timestamp).isoformat(),
-            'operation_type': operation_type,
-            'operation_data': operation_data,
-            'input_hash': input_hash,
-            'output_hash': output_hash,
-            'previous_hash': previous_hash,
-            'chain_index': chain_index
-        }
-        
-        # Generate receipt hash (proof of work)
-        receipt_hash = self._hash_data(receipt_data)
-        receipt_data['receipt_hash'] = receipt_hash
+        return self.generate_receipts_batch(
+            [(operation_type, operation_data, input_data, output_data)])[0]
+    
+    def generate_receipts_batch(self, ops):
+        """
+        Generate chained receipts for many operations in one transaction
         
-        # Store receipt
-        self._store_receipt(receipt_data)
+        Args:
+            ops: Sequence of (operation_type, operation_data, input_data, output_data)
         
-        return receipt_data
+        Returns:
+            list: Receipts in chain order
+        """
+        ops = list(ops)
+        with self._lock:
+            if not self._chain_index_unique:
+                # A stale head wouldn't be caught on insert, so never trust the cache
+                self._last_hash, self._last_index = self._load_chain_head()
+            receipts = self._build_receipts(ops)
+            try:
+                self._store_receipts(receipts)
+            except sqlite3.IntegrityError:
+                # Another writer extended the chain since the head was cached
+                self._last_hash, self._last_index = self._load_chain_head()
+                receipts = self._build_receipts(ops)
+                self._store_receipts(receipts)
+            
+            # Refresh planner statistics after bulk loads
+            if len(receipts) >= ANALYZE_BATCH_SIZE:
+                self._conn.execute('ANALYZE')
+        
+        return receipts
+    
+    def _build_receipts(self, ops):
+        """Hash and chain receipts for ops, starting at the current chain head"""
+        # Seed the chain once; later links come from the receipts built below
+        previous_hash = self._last_hash
+        chain_index = self._last_index + 1
+        new_hash = self._new_hash
+        
+        # Each receipt embeds its predecessor's hash, so receipts are
+        # serialized and digested in chain order, one C call per receipt
+        receipts = []
+        for operation_type, operation_data, input_data, output_data in ops:
+            timestamp = time.time()
+            
+            # Create receipt data
+            receipt_data = {
+                'timestamp': timestamp,
+                'datetime': datetime.fromtimestamp(timestamp).isoformat(),
+                'operation_type': operation_type,
+                'operation_data': operation_data,
+                'input_hash': new_hash(_canon(input_data)).hexdigest(),
+                'output_hash': new_hash(_canon(output_data)).hexdigest(),
+                'previous_hash': previous_hash,
+                'chain_index': chain_index
+            }
+            
+            # Generate receipt hash (proof of work)
+            receipt_data['receipt_hash'] = new_hash(_receipt_bytes(receipt_data)).hexdigest()
+            receipts.append(receipt_data)
+            
+            previous_hash = receipt_data['receipt_hash']
+            chain_index += 1
+        
+        return receipts
     
     def verify_receipt(self, receipt_hash):
         """
@@ -97,14 +354,26 @@ class TECPCore:
         Returns:
             dict: Verification result
         """
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('''SELECT * FROM receipts WHERE receipt_hash = ?''', (receipt_hash,))
-        row = c.fetchone()
+        with self._lock:
+            return self._verify_receipt(receipt_hash)
+    
+    def _verify_receipt(self, receipt_hash):
+        """verify_receipt() body; caller holds the lock"""
+        c = self._conn.cursor()
+        
+        if isinstance(receipt_hash, bytes):
+            receipt_hash = receipt_hash.hex()
+        try:
+            digest = bytes.fromhex(receipt_hash)
+        except ValueError:
+            digest = None
+        
+        row = None
+        if digest is not None:
+            c.execute(self._SELECT_RECEIPT_SQL, (digest,))
+            row = c.fetchone()
         
         if not row:
-            conn.close()
             return {'valid': False, 'error': 'Receipt not found'}
         
         # Reconstruct receipt data
@@ -114,29 +383,25 @@ class TECPCore:
             'operation_data': row[3],
             'input_hash': row[4],
             'output_hash': row[5],
-            'previous_hash': row[7],
+            'previous_hash': _hash_to_hex(row[7]),
             'chain_index': row[8]
         }
         
-        # Verify hash
-        computed_hash = self._hash_data(receipt_data)
-        valid = computed_hash == receipt_hash
+        # Verify hash against the stored digest, not the caller's spelling of it
+        computed_hash = self._hash_receipt(receipt_data)
+        valid = computed_hash == _hash_to_hex(row[6])
         
         # Verify chain
         if row[8] > 0:  # Not first receipt
-            c.execute('''SELECT receipt_hash FROM receipts WHERE chain_index = ?''', 
-                     (row[8] - 1,))
+            c.execute(self._SELECT_HASH_AT_SQL, (row[8] - 1,))
             prev_row = c.fetchone()
             if prev_row and prev_row[0] != row[7]:
                 valid = False
         
-        # Log verification
-        c.execute('''INSERT INTO verification_log (timestamp, receipt_id, verified, verifier)
-                     VALUES (?, ?, ?, ?)''',
-                  (time.time(), row[0], valid, 'system'))
-        
-        conn.commit()
-        conn.close()
+        # Log verification; rows are written in batches by flush_verification_log()
+        self._verify_log_buffer.append((time.time(), row[0], valid, 'system'))
+        if len(self._verify_log_buffer) >= self._verify_log_flush_every:
+            self.flush_verification_log()
         
         return {
             'valid': valid,
@@ -144,190 +409,318 @@ class TECPCore:
             'verified_at': datetime.now().isoformat()
         }
     
-    def get_receipt_chain(self, start_index=0, count=10):
-        """Get receipt chain for audit"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('''SELECT * FROM receipts WHERE chain_index >= ? 
-                     ORDER BY chain_index LIMIT ?''', (start_index, count))
+    def flush_verification_log(self):
+        """Write buffered verification results to verification_log in one transaction"""
+        with self._lock:
+            if not self._verify_log_buffer:
+                return
+            
+            conn = self._conn
+            try:
+                conn.execute('BEGIN')
+                conn.executemany(self._INSERT_VERIFICATION_SQL, self._verify_log_buffer)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            self._verify_log_buffer.clear()
+    
+    def get_receipt_chain(self, start_index=0, count=10, include_iso=False):
+        """
+        Get receipt chain for audit
         
-        rows = c.fetchall()
-        conn.close()
+        Entries carry the raw float 'timestamp'; pass include_iso=True to also
+        get a formatted 'datetime' string per entry.
+        """
+        with self._read_lock:
+            c = self._reader.cursor()
+            c.execute(self._SELECT_CHAIN_SQL, (start_index, count))
+            rows = c.fetchall()
         
         chain = []
         for row in rows:
-            chain.append({
+            entry = {
                 'chain_index': row[8],
                 'timestamp': row[1],
-                'datetime': datetime.fromtimestamp(row[1]).isoformat(),
                 'operation_type': row[2],
-                'receipt_hash': row[6],
-                'previous_hash': row[7]
-            })
+                'receipt_hash': _hash_to_hex(row[6]),
+                'previous_hash': _hash_to_hex(row[7])
+            }
+            if include_iso:
+                entry['datetime'] = datetime.fromtimestamp(row[1]).isoformat()
+            chain.append(entry)
         
         return chain
     
     def get_stats(self):
         """Get TECP statistics"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('SELECT COUNT(*) FROM receipts')
-        total_receipts = c.fetchone()[0]
-        
-        c.execute('SELECT COUNT(*) FROM verification_log WHERE verified = 1')
-        verified_count = c.fetchone()[0]
-        
-        c.execute('SELECT operation_type, COUNT(*) FROM receipts GROUP BY operation_type')
-        by_type = dict(c.fetchall())
-        
-        conn.close()
-        
-        return {
-            'total_receipts': total_receipts,
-            'verified_operations': verified_count,
-            'by_operation_type': by_type,
-            'chain_integrity': self._verify_chain_integrity()
-        }
+        self.flush_verification_log()
+        with self._read_lock:
+            c = self._reader.cursor()
+            
+            # One read transaction, so every query sees the same WAL snapshot
+            # even while receipts are being committed
+            c.execute('BEGIN')
+            try:
+                c.execute('SELECT COUNT(*) FROM receipts')
+                total_receipts = c.fetchone()[0]
+                
+                c.execute('SELECT COUNT(*) FROM verification_log WHERE verified = 1')
+                verified_count = c.fetchone()[0]
+                
+                c.execute('SELECT operation_type, COUNT(*) FROM receipts GROUP BY operation_type')
+                by_type = dict(c.fetchall())
+                
+                chain_integrity = self._verify_chain_integrity(c)
+            finally:
+                self._reader.rollback()
+            
+            return {
+                'total_receipts': total_receipts,
+                'verified_operations': verified_count,
+                'by_operation_type': by_type,
+                'chain_integrity': chain_integrity
+            }
     
-    def _hash_data(self, data):
-        """Generate SHA-256 hash of data"""
-        if isinstance(data, dict):
-            data = json.dumps(data, sort_keys=True)
-        elif not isinstance(data, str):
-            data = str(data)
-        
-        return hashlib.sha256(data.encode()).hexdigest()
+    def _hash_receipt(self, receipt_data):
+        """Receipt hash over RECEIPT_HASH_FIELDS only"""
+        return self._new_hash(_receipt_bytes(receipt_data)).hexdigest()
     
-    def _get_last_receipt_hash(self):
-        """Get hash of last receipt for chaining"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('SELECT receipt_hash FROM receipts ORDER BY chain_index DESC LIMIT 1')
-        row = c.fetchone()
-        
-        conn.close()
-        
-        return row[0] if row else '0' * 64  # Genesis hash
+    def _load_chain_head(self):
+        """Get (hash, chain index) of the last receipt for chaining"""
+        with self._lock:
+            c = self._conn.cursor()
+            
+            c.execute('SELECT receipt_hash, chain_index FROM receipts ORDER BY chain_index DESC LIMIT 1')
+            row = c.fetchone()
+        
+        return (_hash_to_hex(row[0]), row[1]) if row else (GENESIS_HASH.hex(), -1)
     
-    def _get_next_chain_index(self):
-        """Get next chain index"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
-        c.execute('SELECT MAX(chain_index) FROM receipts')
-        row = c.fetchone()
+    def _store_receipts(self, receipts):
+        """Store receipts in database with a single commit"""
+        if not receipts:
+            return
         
-        conn.close()
-        
-        return (row[0] + 1) if row[0] is not None else 0
-    
-    def _store_receipt(self, receipt_data):
-        """Store receipt in database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         c = conn.cursor()
         
-        c.execute('''INSERT INTO receipts 
-                     (timestamp, operation_type, operation_data, input_hash, 
-                      output_hash, receipt_hash, previous_hash, chain_index)
-                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
-                  (receipt_data['timestamp'],
-                   receipt_data['operation_type'],
-                   receipt_data['operation_data'],
-                   receipt_data['input_hash'],
-                   receipt_data['output_hash'],
-                   receipt_data['receipt_hash'],
-                   receipt_data['previous_hash'],
-                   receipt_data['chain_index']))
-        
-        conn.commit()
-        conn.close()
+        try:
+            conn.execute('BEGIN')
+            c.executemany(self._INSERT_RECEIPT_SQL,
+                          [(r['timestamp'],
+                            r['operation_type'],
+                            r['operation_data'],
+                            r['input_hash'],
+                            r['output_hash'],
+                            bytes.fromhex(r['receipt_hash']),
+                            bytes.fromhex(r['previous_hash']),
+                            r['chain_index']) for r in receipts])
+            self._advance_checkpoint(c, receipts)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        
+        self._last_hash = receipts[-1]['receipt_hash']
+        self._last_index = receipts[-1]['chain_index']
     
-    def _verify_chain_integrity(self):
-        """Verify entire receipt chain integrity"""
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        
+    def _advance_checkpoint(self, c, receipts):
+        """
+        Move the integrity checkpoint over a batch being stored in the open
+        transaction. Links in the batch were built from the chain head, so
+        they're valid without a scan; anything another writer appended since
+        the checkpoint is checked once here.
+        """
+        first_index = receipts[0]['chain_index']
+        c.execute(self._SELECT_CHECKPOINT_SQL)
+        through, valid_links = c.fetchone()
+        if through is None or through >= first_index:
+            return
+        
+        if through == first_index - 1:
+            valid_links += len(receipts) - (1 if first_index == 0 else 0)
+        else:
+            c.execute(self._COUNT_VALID_LINKS_SQL, (through,))
+            valid_links += c.fetchone()[0]
+        
+        c.executemany('UPDATE chain_meta SET value = ? WHERE key = ?',
+                      [(receipts[-1]['chain_index'], 'verified_through_index'),
+                       (valid_links, 'valid_links')])
+    
+    def _verify_chain_integrity(self, c):
+        """
+        Verify receipt chain integrity using cursor c - links up to the
+        checkpoint are taken from chain_meta, only later ones are scanned
+        """
         c.execute('SELECT COUNT(*) FROM receipts')
         total = c.fetchone()[0]
         
         if total == 0:
-            conn.close()
             return 100.0
         
-        c.execute('''SELECT receipt_hash, previous_hash, chain_index 
-                     FROM receipts ORDER BY chain_index''')
-        
-        rows = c.fetchall()
-        conn.close()
+        c.execute(self._SELECT_CHECKPOINT_SQL)
+        through, valid_links = c.fetchone()
+        if through is None:
+            through, valid_links = -1, 0
         
-        valid_links = 0
-        for i in range(1, len(rows)):
-            if rows[i][1] == rows[i-1][0]:  # previous_hash matches
-                valid_links += 1
+        c.execute(self._COUNT_VALID_LINKS_SQL, (through,))
+        valid_links += c.fetchone()[0]
         
         integrity = (valid_links / (total - 1) * 100) if total > 1 else 100.0
         return round(integrity, 2)
 
 
 class TECPIntegration:
-    """Integration layer for AI-LA with TECP"""
+    """
+    Integration layer for AI-LA with TECP
     
-    def __init__(self, tecp_core):
+    By default record_* write the receipt before returning it. With
+    asynchronous=True they return a Future instead, and a background thread
+    writes queued ops in batches of up to ASYNC_BATCH_SIZE per transaction;
+    each Future resolves to its receipt. Recording raises RuntimeError once
+    an asynchronous integration has been closed.
+    """
+    
+    def __init__(self, tecp_core, asynchronous=False):
         self.tecp = tecp_core
+        self._queue = None
+        self._worker = None
+        if asynchronous:
+            # Keeps close() from posting its sentinel between _record's check
+            # and its put, which would strand that op's Future
+            self._shutdown_lock = threading.Lock()
+            self._queue = queue.Queue()
+            # The thread holds only the queue and core, so an integration that
+            # is dropped without close() can still be collected
+            self._worker = threading.Thread(target=self._drain_worker, daemon=True,
+                                            args=(self._queue, tecp_core), name='tecp-recorder')
+            self._worker.start()
+            close_at_exit(self)
+    
+    def __del__(self):
+        self.close()
+    
+    @staticmethod
+    def _drain_worker(work_queue, tecp):
+        """Write queued ops in batches until close() posts the None sentinel"""
+        while True:
+            item = work_queue.get()
+            items = []
+            while item is not None:
+                items.append(item)
+                if len(items) >= ASYNC_BATCH_SIZE:
+                    break
+                try:
+                    item = work_queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            if items:
+                try:
+                    receipts = tecp.generate_receipts_batch([op for op, _ in items])
+                except BaseException as e:
+                    for _, future in items:
+                        future.set_exception(e)
+                else:
+                    for (_, future), receipt in zip(items, receipts):
+                        future.set_result(receipt)
+                for _ in items:
+                    work_queue.task_done()
+            
+            if item is None:
+                work_queue.task_done()
+                return
+    
+    def flush(self):
+        """Block until every queued op has been written"""
+        if self._queue is not None:
+            self._queue.join()
+    
+    def close(self):
+        """Write any queued ops and stop the background recorder"""
+        if getattr(self, '_worker', None) is None:
+            return
+        with self._shutdown_lock:
+            worker, self._worker = self._worker, None
+            if worker is None:
+                return
+            self._queue.put(None)
+        forget_at_exit(self)
+        worker.join()
+    
+    def _record(self, op, batch):
+        """
+        Generate a receipt now, queue the op on batch for commit_batch(), or
+        hand it to the background recorder and return a Future
+        """
+        if batch is not None:
+            batch.append(op)
+            return None
+        if self._queue is not None:
+            future = Future()
+            with self._shutdown_lock:
+                if self._worker is None:
+                    raise RuntimeError('cannot record after close()')
+                self._queue.put((op, future))
+            return future
+        return self.tecp.generate_receipt(*op)
+    
+    def commit_batch(self, batch):
+        """Generate receipts for every queued op in one transaction and clear the batch"""
+        receipts = self.tecp.generate_receipts_batch(batch)
+        batch.clear()
+        return receipts
     
-    def record_decision(self, description, decisions):
+    def record_decision(self, description, decisions, batch=None):
         """Record autonomous decision with cryptographic proof"""
-        return self.tecp.generate_receipt(
-            operation_type='autonomous_decision',
-            operation_data=json.dumps({
+        return self._record((
+            'autonomous_decision',
+            json.dumps({
                 'confidence': decisions.get('confidence', 0),
                 'tech_stack': decisions.get('tech_stack', {})
             }),
-            input_data=description,
-            output_data=decisions
-        )
+            description,
+            decisions
+        ), batch)
     
-    def record_generation(self, description, result):
+    def record_generation(self, description, result, batch=None):
         """Record code generation with cryptographic proof"""
-        return self.tecp.generate_receipt(
-            operation_type='code_generation',
-            operation_data=json.dumps({
+        return self._record((
+            'code_generation',
+            json.dumps({
                 'success': result.get('success', False),
                 'files_count': len(result.get('files', [])),
                 'project_name': result.get('spec', {}).get('name', 'unknown')
             }),
-            input_data=description,
-            output_data=str(result.get('path', ''))
-        )
+            description,
+            str(result.get('path', ''))
+        ), batch)
     
-    def record_prediction(self, project_path, predictions):
+    def record_prediction(self, project_path, predictions, batch=None):
         """Record predictions with cryptographic proof"""
-        return self.tecp.generate_receipt(
-            operation_type='prediction',
-            operation_data=json.dumps({
+        return self._record((
+            'prediction',
+            json.dumps({
                 'next_features_count': len(predictions.get('next_features', [])),
                 'bugs_count': len(predictions.get('potential_bugs', [])),
                 'security_count': len(predictions.get('security_vulnerabilities', []))
             }),
-            input_data=project_path,
-            output_data=predictions
-        )
+            project_path,
+            predictions
+        ), batch)
     
-    def record_evolution(self, evolution_data):
+    def record_evolution(self, evolution_data, batch=None):
         """Record AI self-evolution with cryptographic proof"""
-        return self.tecp.generate_receipt(
-            operation_type='self_evolution',
-            operation_data=json.dumps({
+        return self._record((
+            'self_evolution',
+            json.dumps({
                 'evolved': evolution_data.get('evolved', False),
                 'generation': evolution_data.get('generation', 0),
                 'improvements': evolution_data.get('improvements', [])
             }),
-            input_data='self_analysis',
-            output_data=evolution_data
-        )
+            'self_analysis',
+            evolution_data
+        ), batch)
 
 
 if __name__ == '__main__':